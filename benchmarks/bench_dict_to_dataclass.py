@@ -0,0 +1,74 @@
+"""Compare dict_to_dataclass against the previous reflection based implementation.
+
+Usage: python -m benchmarks.bench_dict_to_dataclass [--count 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Type, TypeVar, cast
+
+from client.models.instance import InstanceInfo
+from client.utils import dict_to_dataclass, normalize_keys
+
+T = TypeVar("T")
+
+TESTDATA = Path(__file__).parent.parent / "tests" / "testdata" / "v2_get_instances_instance.json"
+
+
+def reference_dict_to_dataclass(cls: Type[T], data: Dict[str, Any]) -> T:
+    """The implementation before per-class decoding plans."""
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls} is not a dataclass type")
+
+    kwargs: Dict[str, Any] = {}
+    for field in fields(cls):
+        if field.name in data:
+            if is_dataclass(field.type) and isinstance(data[field.name], dict):
+                kwargs[field.name] = reference_dict_to_dataclass(cast(Type[T], field.type), data[field.name])
+            else:
+                kwargs[field.name] = data[field.name]
+    return cls(**kwargs)
+
+
+def make_instances(count: int) -> list[dict[str, Any]]:
+    with open(TESTDATA, encoding="utf-8") as f:
+        template = json.load(f)
+    return [{**template, "name": f"instance{i}.example.com"} for i in range(count)]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="instances per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs, the fastest one is reported")
+    args = parser.parse_args()
+
+    instances = make_instances(args.count)
+    reference = best_of(
+        args.repeat,
+        lambda: [reference_dict_to_dataclass(InstanceInfo, normalize_keys(raw)) for raw in instances],
+    )
+    planned = best_of(args.repeat, lambda: [dict_to_dataclass(InstanceInfo, raw) for raw in instances])
+    compact = best_of(args.repeat, lambda: [dict_to_dataclass(InstanceInfo, raw, compact=True) for raw in instances])
+
+    print(f"{args.count} InstanceInfo objects, best of {args.repeat}")
+    print(f"  reference:   {reference * 1000:8.1f} ms  {args.count / reference:10.0f} objects/s")
+    print(f"  cached plan: {planned * 1000:8.1f} ms  {args.count / planned:10.0f} objects/s")
+    print(f"  speedup:     {reference / planned:8.2f}x")
+    print(f"  compact:     {compact * 1000:8.1f} ms  {args.count / compact:10.0f} objects/s")
+
+
+if __name__ == "__main__":
+    main()
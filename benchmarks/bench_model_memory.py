@@ -0,0 +1,84 @@
+"""Compare the memory footprint of slotted, interned models against plain dataclasses.
+
+Reports the retained memory and the conversion time of the default and the compact conversion.
+
+Usage: python -m benchmarks.bench_model_memory [--count 20000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import fields, make_dataclass
+from functools import partial
+from typing import Any
+
+from benchmarks.bench_dict_to_dataclass import best_of, make_instances, reference_dict_to_dataclass
+from client.models.instance import BackendParams, InstanceInfo
+from client.utils import dict_to_dataclass, normalize_keys
+
+# the models without __slots__ and without interning
+PlainBackendParams = make_dataclass("PlainBackendParams", [(f.name, f.type, f) for f in fields(BackendParams)])
+PlainInstanceInfo = make_dataclass(
+    "PlainInstanceInfo",
+    [(f.name, PlainBackendParams if f.name == "beparams" else f.type) for f in fields(InstanceInfo)],
+)
+
+
+def make_bulk_response(count: int, nodes: int = 50) -> str:
+    """Return the JSON text of a bulk listing spread over ``nodes`` nodes."""
+    instances = make_instances(count)
+    for i, instance in enumerate(instances):
+        instance["pnode"] = f"node{i % nodes}.example.com"
+        instance["snodes"] = [f"node{(i + 1) % nodes}.example.com"]
+        instance["nic.ips"] = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"]
+    return json.dumps(instances)
+
+
+def retained_memory(text: str, convert: Callable[[dict[str, Any]], object]) -> tuple[int, list[object]]:
+    """Return the bytes retained by the objects converted from a parsed response."""
+    gc.collect()
+    tracemalloc.start()
+    raw = json.loads(text)
+    objects = [convert(instance_raw) for instance_raw in raw]
+    del raw
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, objects
+
+
+def convert_all(convert: Callable[[dict[str, Any]], object], raw: list[dict[str, Any]]) -> list[object]:
+    return [convert(data) for data in raw]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="number of instances")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs, the fastest one is reported")
+    args = parser.parse_args()
+
+    text = make_bulk_response(args.count)
+    raw = json.loads(text)
+    variants: list[tuple[str, Callable[[dict[str, Any]], object]]] = [
+        ("plain dataclass", lambda data: reference_dict_to_dataclass(PlainInstanceInfo, normalize_keys(data))),
+        ("slotted + interned", lambda data: dict_to_dataclass(InstanceInfo, data)),
+        ("compact", lambda data: dict_to_dataclass(InstanceInfo, data, compact=True)),
+    ]
+
+    print(f"{args.count} InstanceInfo objects, conversion time best of {args.repeat}")
+    plain = 0
+    for name, convert in variants:
+        retained, objects = retained_memory(text, convert)
+        del objects
+        seconds = best_of(args.repeat, partial(convert_all, convert, raw))
+        plain = plain or retained
+        print(
+            f"  {name:19} {retained / 2**20:8.1f} MiB  {retained / args.count:8.0f} bytes/object"
+            f"  {(1 - retained / plain) * 100:5.1f} % saved  {seconds * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
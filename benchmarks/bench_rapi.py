@@ -0,0 +1,144 @@
+"""Measure the client's throughput against a local fake RAPI over HTTPS.
+
+Runs listing, conversion, job waiting and batch operation scenarios. Results can be saved and
+compared with an earlier run; slower scenarios are reported as regressions with exit code 1.
+
+Usage: python -m benchmarks.bench_rapi [--instances 10000] [--latency 0.002]
+           [--output results.json] [--baseline results.json] [--threshold 0.15]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import urllib3
+
+from benchmarks.fake_rapi import FakeRapi, run_fake_rapi
+from client import GanetiRapiClient
+
+
+@dataclass
+class Scenario:
+    name: str
+    # number of operations (objects, requests or jobs) of one run
+    operations: int
+    unit: str
+    run: Callable[[], object]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def scenarios(client: GanetiRapiClient, rapi: FakeRapi, args: argparse.Namespace) -> list[Scenario]:
+    names = [instance["name"] for instance in rapi.instances]
+    single = names[: args.requests]
+    batch = names[: args.batch]
+
+    def _get_single() -> None:
+        for name in single:
+            client.instance_service.get_instance(name)
+
+    def _wait_long_poll() -> None:
+        client.job_service.wait_for_job(client.instance_service.start_instance(names[0]), long_poll=True)
+
+    def _wait_poll() -> None:
+        client.job_service.wait_for_job(client.instance_service.start_instance(names[0]), poll_interval=1)
+
+    def _batch() -> None:
+        results = client.instance_service.migrate_instances(batch, max_workers=args.workers, wait=True, poll_interval=1)
+        if not all(result.ok for result in results.values()):
+            raise RuntimeError("batch migration failed")
+
+    return [
+        Scenario("get_instances", len(names), "instances", client.instance_service.get_instances),
+        Scenario("iter_instances", len(names), "instances", lambda: list(client.instance_service.iter_instances())),
+        Scenario(
+            "get_partial_instances",
+            len(names),
+            "instances",
+            lambda: client.instance_service.get_partial_instances(["name", "pnode", "status"]),
+        ),
+        Scenario("get_nodes", len(rapi.nodes), "nodes", client.node_service.get_nodes),
+        Scenario("get_instance", len(single), "requests", _get_single),
+        Scenario("wait_for_job_long_poll", 1, "jobs", _wait_long_poll),
+        Scenario("wait_for_job_poll", 1, "jobs", _wait_poll),
+        Scenario("migrate_instances_wait", len(batch), "jobs", _batch),
+    ]
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return a description of every scenario that got slower than ``threshold`` (0.1 = 10%)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None or before["operations"] != result["operations"]:
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {before['seconds'] * 1000:.1f} ms -> {result['seconds'] * 1000:.1f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=10000, help="instances of the fake cluster")
+    parser.add_argument("--nodes", type=int, default=50, help="nodes of the fake cluster")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds the fake RAPI adds to every request")
+    parser.add_argument("--job-run-time", type=float, default=0.2, help="seconds every job runs")
+    parser.add_argument("--requests", type=int, default=200, help="requests of the get_instance scenario")
+    parser.add_argument("--batch", type=int, default=80, help="instances of the batch scenario")
+    parser.add_argument("--workers", type=int, default=8, help="threads of the batch scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the fastest one is reported")
+    parser.add_argument("--output", type=Path, help="save the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown reported as regression")
+    args = parser.parse_args()
+
+    # the fake RAPI uses a self-signed certificate; requests prefers these variables over verify=False
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    for variable in ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"):
+        os.environ.pop(variable, None)
+    rapi = FakeRapi(
+        instances=args.instances,
+        nodes=args.nodes,
+        latency=args.latency,
+        job_queued_time=args.job_run_time / 4,
+        job_run_time=args.job_run_time,
+    )
+    results: dict[str, Any] = {}
+    with run_fake_rapi(rapi) as server:
+        with GanetiRapiClient(server.address, "bench", "bench", ssl_verify=False) as client:
+            print(f"{args.instances} instances, {args.latency * 1000:.1f} ms latency, best of {args.repeat}")
+            for scenario in scenarios(client, rapi, args):
+                seconds = best_of(args.repeat, scenario.run)
+                results[scenario.name] = {"seconds": seconds, "operations": scenario.operations}
+                print(
+                    f"  {scenario.name:24} {seconds * 1000:9.1f} ms"
+                    f"  {scenario.operations / seconds:10.0f} {scenario.unit}/s"
+                )
+        print(f"  {rapi.requests} requests served")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
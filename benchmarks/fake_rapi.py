@@ -0,0 +1,346 @@
+"""A local stand-in for the Ganeti RAPI to benchmark the client over real HTTPS.
+
+The server holds a synthetic cluster and answers the read endpoints, instance operations, jobs
+and job queries used by the client. Jobs go from queued to running to success on a timer. It
+needs the ``openssl`` command to create a self-signed certificate.
+
+Usage: python -m benchmarks.fake_rapi [--instances 10000] [--nodes 50] [--latency 0.005]
+"""
+
+import argparse
+import base64
+import json
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.bench_dict_to_dataclass import make_instances
+from client.models.job import JOB_STATUS_QUEUED, JOB_STATUS_RUNNING, JOB_STATUS_SUCCESS
+
+NODE_TEMPLATE = Path(__file__).parent.parent / "tests" / "testdata" / "v2_get_nodes_node.json"
+
+# PUT/POST instances/<name>/<action> operations creating a job
+_INSTANCE_OPERATIONS = {
+    ("PUT", "startup"),
+    ("PUT", "shutdown"),
+    ("PUT", "migrate"),
+    ("PUT", "failover"),
+    ("POST", "reboot"),
+}
+
+
+def make_cluster(instances: int, nodes: int) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Return the bulk data of a cluster with ``instances`` DRBD instances spread over ``nodes`` nodes."""
+    with open(NODE_TEMPLATE, encoding="utf-8") as f:
+        node_template = json.load(f)
+    instance_list = make_instances(instances)
+    node_list = [
+        {**node_template, "name": f"node{i}.example.com", "uuid": f"node-uuid-{i}", "pinst_list": [], "sinst_list": []}
+        for i in range(nodes)
+    ]
+    for i, instance in enumerate(instance_list):
+        pnode, snode = node_list[i % nodes], node_list[(i + 1) % nodes]
+        instance["pnode"] = pnode["name"]
+        instance["snodes"] = [snode["name"]]
+        instance["uuid"] = f"instance-uuid-{i}"
+        instance["nic.ips"] = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"]
+        pnode["pinst_list"].append(instance["name"])
+        snode["sinst_list"].append(instance["name"])
+    for node in node_list:
+        node["pinst_cnt"] = len(node["pinst_list"])
+        node["sinst_cnt"] = len(node["sinst_list"])
+    return instance_list, node_list
+
+
+@dataclass
+class FakeJob:
+    """Job whose status only depends on the time since it was submitted."""
+
+    id: int
+    op_id: str
+    submitted: float
+    queued_time: float
+    run_time: float
+    log: list[list[Any]] = field(default_factory=list)
+
+    def status_at(self, now: float) -> str:
+        if now < self.submitted + self.queued_time:
+            return JOB_STATUS_QUEUED
+        if now < self.submitted + self.queued_time + self.run_time:
+            return JOB_STATUS_RUNNING
+        return JOB_STATUS_SUCCESS
+
+    def next_change(self, now: float) -> Optional[float]:
+        """Time of the next status change, None if the job is finalized."""
+        for change in (self.submitted + self.queued_time, self.submitted + self.queued_time + self.run_time):
+            if now < change:
+                return change
+        return None
+
+    def to_json(self, now: float) -> dict[str, Any]:
+        status = self.status_at(now)
+        return {
+            "id": self.id,
+            "status": status,
+            "ops": [{"OP_ID": self.op_id}],
+            "opstatus": [status],
+            "opresult": [None],
+            "oplog": [self.log_entries(now)],
+        }
+
+    def log_entries(self, now: float) -> list[list[Any]]:
+        entries = []
+        if self.status_at(now) != JOB_STATUS_QUEUED:
+            entries.append([1, _timestamp(self.submitted + self.queued_time), "message", f"{self.op_id} started"])
+        if self.status_at(now) == JOB_STATUS_SUCCESS:
+            end = self.submitted + self.queued_time + self.run_time
+            entries.append([2, _timestamp(end), "message", f"{self.op_id} done"])
+        return entries
+
+
+def _timestamp(seconds: float) -> list[int]:
+    return [int(seconds), int(seconds % 1 * 1e6)]
+
+
+class FakeRapi:
+    """State of the fake cluster, shared by the request handler threads."""
+
+    def __init__(
+        self,
+        instances: int = 1000,
+        nodes: int = 20,
+        latency: float = 0.0,
+        job_queued_time: float = 0.05,
+        job_run_time: float = 0.2,
+        max_wait: float = 5.0,
+        username: str = "bench",
+        password: str = "bench",
+    ):
+        self.instances, self.nodes = make_cluster(instances, nodes)
+        self.instances_by_name = {instance["name"]: instance for instance in self.instances}
+        self.nodes_by_name = {node["name"]: node for node in self.nodes}
+        self.latency = latency
+        self.job_queued_time = job_queued_time
+        self.job_run_time = job_run_time
+        self.max_wait = max_wait
+        self.authorization = "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.jobs: dict[int, FakeJob] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+        # serialized listings, by path and query
+        self._listings: dict[str, bytes] = {}
+
+    def submit_job(self, op_id: str) -> int:
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self.jobs[job_id] = FakeJob(job_id, op_id, time.monotonic(), self.job_queued_time, self.job_run_time)
+        return job_id
+
+    def listing(self, resource: str, query: dict[str, list[str]]) -> bytes:
+        key = f"{resource}?{sorted(query.items())}"
+        cached = self._listings.get(key)
+        if cached is not None:
+            return cached
+        objects = self.instances if resource == "instances" else self.nodes
+        if "bulk" not in query:
+            data: list[dict[str, Any]] = [{"id": obj["name"], "uri": f"/2/{resource}/{obj['name']}"} for obj in objects]
+        elif "fields" in query:
+            fields = query["fields"][0].split(",")
+            data = [{name: obj.get(name) for name in fields} for obj in objects]
+        else:
+            data = objects
+        body = json.dumps(data).encode()
+        self._listings[key] = body
+        return body
+
+    def wait_for_change(self, job: FakeJob, previous_status: Optional[str]) -> Optional[dict[str, Any]]:
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            now = time.monotonic()
+            status = job.status_at(now)
+            if status != previous_status:
+                return {"job_info": [status], "log_entries": job.log_entries(now)}
+            next_change = job.next_change(now)
+            if next_change is None or now >= deadline:
+                return None
+            time.sleep(max(min(next_change, deadline) - now, 0.001))
+
+    def query_jobs(self, body: dict[str, Any]) -> dict[str, Any]:
+        fields = body["fields"]
+        ids = set(_filter_ids(body.get("qfilter")))
+        now = time.monotonic()
+        data = []
+        for job_id in sorted(ids):
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            values = job.to_json(now)
+            data.append([[0, values.get(name)] for name in fields])
+        return {"fields": [{"name": name} for name in fields], "data": data}
+
+
+def _filter_ids(qfilter: Any) -> Iterator[int]:
+    """Job ids of a filter built from ``=`` expressions on ``id``, combined with ``|``."""
+    if not qfilter:
+        return
+    if qfilter[0] == "=" and qfilter[1] == "id":
+        yield qfilter[2]
+    elif qfilter[0] == "|":
+        for operand in qfilter[1:]:
+            yield from _filter_ids(operand)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeRapiServer"
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't let them wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        rapi = self.server.rapi
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        with rapi._lock:
+            rapi.requests += 1
+        if self.headers.get("Authorization") != rapi.authorization:
+            self._send(401, {"message": "Unauthorized"})
+            return
+        if rapi.latency:
+            time.sleep(rapi.latency)
+
+        url = urlsplit(self.path)
+        path = url.path.removeprefix("/2/").strip("/")
+        query = parse_qs(url.query)
+        body = json.loads(raw_body) if raw_body else None
+        try:
+            self._route(method, path, query, body)
+        except KeyError as e:
+            self._send(404, {"message": f"Not found: {e}"})
+
+    def _route(self, method: str, path: str, query: dict[str, list[str]], body: Any) -> None:
+        rapi = self.server.rapi
+        parts = path.split("/")
+        if method == "GET" and path == "info":
+            self._send(200, {"name": "cluster.example.com", "master": "localhost"})
+        elif method == "GET" and path in ("instances", "nodes"):
+            self._send_bytes(200, rapi.listing(path, query))
+        elif method == "GET" and len(parts) == 2 and parts[0] == "instances":
+            self._send(200, rapi.instances_by_name[parts[1]])
+        elif method == "GET" and len(parts) == 2 and parts[0] == "nodes":
+            self._send(200, rapi.nodes_by_name[parts[1]])
+        elif len(parts) == 3 and parts[0] == "instances" and (method, parts[2]) in _INSTANCE_OPERATIONS:
+            _ = rapi.instances_by_name[parts[1]]
+            self._send(200, rapi.submit_job(f"OP_INSTANCE_{parts[2].upper()}"))
+        elif method == "GET" and path == "jobs":
+            self._send(200, [{"id": job_id, "uri": f"/2/jobs/{job_id}"} for job_id in sorted(rapi.jobs)])
+        elif method == "GET" and len(parts) == 2 and parts[0] == "jobs":
+            self._send(200, rapi.jobs[int(parts[1])].to_json(time.monotonic()))
+        elif method == "GET" and len(parts) == 3 and parts[0] == "jobs" and parts[2] == "wait":
+            previous = (body or {}).get("previous_job_info")
+            job = rapi.jobs[int(parts[1])]
+            self._send(200, rapi.wait_for_change(job, previous[0] if previous else None))
+        elif method == "PUT" and path == "query/job":
+            self._send(200, rapi.query_jobs(body))
+        else:
+            self._send(501, {"message": f"{method} /2/{path} is not implemented by the fake RAPI"})
+
+    def _send(self, status: int, data: Any) -> None:
+        self._send_bytes(status, json.dumps(data).encode())
+
+    def _send_bytes(self, status: int, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeRapiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rapi: FakeRapi, certfile: str, keyfile: str, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.rapi = rapi
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+def create_certificate(directory: Path) -> tuple[str, str]:
+    """Create a self-signed certificate for 127.0.0.1 and return the certificate and key paths."""
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        raise RuntimeError("The openssl command is required to create the certificate of the fake RAPI")
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1"]
+        + ["-keyout", str(keyfile), "-out", str(certfile)],
+        check=True,
+        capture_output=True,
+    )
+    return str(certfile), str(keyfile)
+
+
+@contextmanager
+def run_fake_rapi(rapi: FakeRapi) -> Iterator[FakeRapiServer]:
+    """Serve ``rapi`` in a background thread while the context is active."""
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = create_certificate(Path(directory))
+        server = FakeRapiServer(rapi, certfile, keyfile)
+    thread = threading.Thread(target=server.serve_forever, name="fake-rapi", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=10000)
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+
+    rapi = FakeRapi(instances=args.instances, nodes=args.nodes, latency=args.latency)
+    with run_fake_rapi(rapi) as server:
+        print(f"Serving {args.instances} instances on https://{server.address}/2/ as bench/bench, Ctrl-C to stop")
+        with suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,35 @@
+import types
+from collections.abc import Sequence
+from typing import Any, Union
+
 from client.api_client import BaseApiClient
 from client.services.instance_service import InstanceService
 from client.services.job_service import JobService
 from client.services.node_service import NodeService
+from client.services.query_service import QueryService
 
 
 class GanetiRapiClient:
-    def __init__(self, rapi_address: str, username: str, password: str, ssl_verify: bool = True):
-        self._client = BaseApiClient(rapi_address, username, password, ssl_verify=ssl_verify)
+    def __init__(
+        self,
+        rapi_address: Union[str, Sequence[str]],
+        username: str,
+        password: str,
+        ssl_verify: bool = True,
+        **kwargs: Any,
+    ):
+        """Create a client; additional keyword arguments are passed on to BaseApiClient."""
+        self._client = BaseApiClient(rapi_address, username, password, ssl_verify=ssl_verify, **kwargs)
         self.instance_service = InstanceService(self._client)
         self.job_service = JobService(self._client)
         self.node_service = NodeService(self._client)
+        self.query_service = QueryService(self._client)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "GanetiRapiClient":
+        return self
+
+    def __exit__(self, exc_type: BaseException, exc_val: BaseException, exc_tb: types.TracebackType) -> None:
+        self.close()
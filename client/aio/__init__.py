@@ -0,0 +1,21 @@
+from client.aio.api_client import AsyncBaseApiClient
+from client.aio.services.instance_service import AsyncInstanceService
+from client.aio.services.job_service import AsyncJobService
+from client.aio.services.node_service import AsyncNodeService
+
+
+class AsyncGanetiRapiClient:
+    def __init__(self, rapi_address: str, username: str, password: str, ssl_verify: bool = True):
+        self._client = AsyncBaseApiClient(rapi_address, username, password, ssl_verify=ssl_verify)
+        self.instance_service = AsyncInstanceService(self._client)
+        self.job_service = AsyncJobService(self._client)
+        self.node_service = AsyncNodeService(self._client)
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def __aenter__(self) -> "AsyncGanetiRapiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
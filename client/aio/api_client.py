@@ -0,0 +1,63 @@
+import types
+from typing import Any
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError("The async client requires httpx, install it with 'pip install ganeti-rapi-client[async]'") from e
+
+from client.api_client import BaseApiClient
+from client.exceptions import GanetiRAPIClientError
+
+
+class AsyncBaseApiClient:
+    """asyncio counterpart of BaseApiClient, built on httpx.AsyncClient."""
+
+    def __init__(self, rapi_address: str, username: str, password: str, ssl_verify: bool = True, timeout: int = 10):
+        self.base_url = f"https://{rapi_address}/2"
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._client = httpx.AsyncClient(
+            auth=(self.username, self.password),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            verify=ssl_verify,
+            timeout=timeout,
+        )
+
+    async def _request(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        try:
+            response = await self._client.request(method, f"{self.base_url}/{endpoint}", **kwargs)
+        except httpx.HTTPError as e:
+            raise GanetiRAPIClientError(f"Client Error: {e}") from e
+
+        if response.is_error:
+            BaseApiClient._handle_error_response(response, f"{self.base_url}/{endpoint}")
+
+        return response
+
+    async def get(self, endpoint: str, **kwargs: Any) -> Any:
+        return (await self._request("GET", endpoint, params=kwargs)).json()
+
+    async def get_with_body(self, endpoint: str, **kwargs: Any) -> Any:
+        """GET with the arguments sent as JSON body, as expected by e.g. ``jobs/<id>/wait``."""
+        return (await self._request("GET", endpoint, json=dict(kwargs))).json()
+
+    async def post(self, endpoint: str, **kwargs: Any) -> Any:
+        return (await self._request("POST", endpoint, json=dict(kwargs))).json()
+
+    async def put(self, endpoint: str, **kwargs: Any) -> Any:
+        return (await self._request("PUT", endpoint, json=dict(kwargs))).json()
+
+    async def delete(self, endpoint: str) -> Any:
+        return (await self._request("DELETE", endpoint)).json()
+
+    async def close(self) -> None:
+        """Close the client and cleanup."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncBaseApiClient":
+        return self
+
+    async def __aexit__(self, exc_type: BaseException, exc_val: BaseException, exc_tb: types.TracebackType) -> None:
+        await self.close()
@@ -0,0 +1,90 @@
+import typing
+from collections.abc import Sequence
+from typing import Any
+
+from client.aio.api_client import AsyncBaseApiClient
+from client.models.instance import InstanceInfo, NewInstance
+from client.models.record import Record
+from client.utils import dataclass_to_dict, dict_to_dataclass, normalize_keys
+
+
+class AsyncInstanceService:
+    ENDPOINT = "instances"
+
+    def __init__(self, api_client: AsyncBaseApiClient):
+        self.api_client = api_client
+
+    async def get_instance_names(self) -> list[str]:
+        instances = await self.api_client.get(self.ENDPOINT)
+        return [instance["id"] for instance in instances]
+
+    async def get_instances(self) -> list[InstanceInfo]:
+        """Get detailed info for all instances in a single bulk request."""
+        instances_raw = await self.api_client.get(self.ENDPOINT, bulk=1)
+        return [dict_to_dataclass(InstanceInfo, instance_raw) for instance_raw in instances_raw]
+
+    async def get_partial_instances(self, fields: Sequence[str]) -> list[Record]:
+        """Get only the given fields (e.g. ``["name", "pnode", "status"]``) for all instances."""
+        instances_raw = await self.api_client.get(self.ENDPOINT, bulk=1, fields=",".join(fields))
+        return [Record(normalize_keys(instance_raw)) for instance_raw in instances_raw]
+
+    async def create_instance(
+        self,
+        new_instance: NewInstance,
+        ip_check: bool = False,
+        name_check: bool = False,
+        start: bool = True,
+        ignore_ipolicy: bool = False,
+    ) -> int:
+        params_raw = dataclass_to_dict(new_instance)
+        # Ensure params is a dict for mypy
+        if not isinstance(params_raw, dict):
+            raise TypeError("Expected dataclass_to_dict to return a dict")
+        params = params_raw
+        params["__version__"] = 1
+        params["mode"] = "create"
+        return typing.cast(
+            int,
+            await self.api_client.post(
+                f"{self.ENDPOINT}",
+                ip_check=ip_check,
+                name_check=name_check,
+                start=start,
+                ignore_ipolicy=ignore_ipolicy,
+                **params,
+            ),
+        )
+
+    async def modify_instance(self, instance_name: str, **kwargs: Any) -> int:
+        return typing.cast(int, await self.api_client.put(f"{self.ENDPOINT}/{instance_name}/modify", **kwargs))
+
+    async def delete_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.delete(f"{self.ENDPOINT}/{instance_name}"))
+
+    async def start_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.put(f"{self.ENDPOINT}/{instance_name}/startup"))
+
+    async def stop_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.put(f"{self.ENDPOINT}/{instance_name}/shutdown"))
+
+    async def restart_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.post(f"{self.ENDPOINT}/{instance_name}/reboot"))
+
+    async def migrate_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.put(f"{self.ENDPOINT}/{instance_name}/migrate"))
+
+    async def failover_instance(self, instance_name: str) -> int:
+        return typing.cast(int, await self.api_client.put(f"{self.ENDPOINT}/{instance_name}/failover"))
+
+    async def grow_instance_disk(self, instance_name: str, disk_index: int, amount: int) -> int:
+        return typing.cast(
+            int, await self.api_client.post(f"{self.ENDPOINT}/{instance_name}/disk/{disk_index}/grow", amount=amount)
+        )
+
+    async def get_instance(self, instance_name: str) -> InstanceInfo:
+        instance_info_raw = await self.api_client.get(f"{self.ENDPOINT}/{instance_name}")
+        return dict_to_dataclass(InstanceInfo, instance_info_raw)
+
+    async def get_instance_info(self, instance_name: str, static: bool = False) -> int:
+        static_value = int(static)  # RAPI bool is 0 or 1 not 'true' or 'false'
+        return typing.cast(int, await self.api_client.get(f"{self.ENDPOINT}/{instance_name}/info", static=static_value))
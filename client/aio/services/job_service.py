@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from client.aio.api_client import AsyncBaseApiClient
+from client.models.job import Job
+from client.utils import dict_to_dataclass
+
+
+class AsyncJobService:
+    ENDPOINT = "jobs"
+
+    def __init__(self, api_client: AsyncBaseApiClient):
+        self.api_client = api_client
+
+    async def get_jobs(self) -> list[int]:
+        jobs_raw = await self.api_client.get(self.ENDPOINT)
+        return [job["id"] for job in jobs_raw]
+
+    async def get_job_info(self, job_id: int) -> Job:
+        job_raw = await self.api_client.get(f"{self.ENDPOINT}/{job_id}")
+        return dict_to_dataclass(Job, job_raw)
+
+    async def cancel_job(self, job_id: int) -> None:
+        await self.api_client.delete(f"{self.ENDPOINT}/{job_id}")
+
+    async def wait_for_job(self, job_id: int, timeout: int = 300, poll_interval: int = 5) -> Job:
+        """Wait until the job is finalized without blocking the event loop."""
+        job_info = await self.get_job_info(job_id)
+        start_time = time.time()
+        while not job_info.is_finalized():
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Job {job_id} timed out after {timeout} seconds")
+            await asyncio.sleep(poll_interval)
+            job_info = await self.get_job_info(job_id)
+
+        return job_info
@@ -0,0 +1,31 @@
+from collections.abc import Sequence
+
+from client.aio.api_client import AsyncBaseApiClient
+from client.models.node import Node
+from client.models.record import Record
+from client.utils import dict_to_dataclass, normalize_keys
+
+
+class AsyncNodeService:
+    ENDPOINT = "nodes"
+
+    def __init__(self, api_client: AsyncBaseApiClient):
+        self.api_client = api_client
+
+    async def get_node_names(self) -> list[str]:
+        nodes = await self.api_client.get(self.ENDPOINT)
+        return [node["id"] for node in nodes]
+
+    async def get_nodes(self) -> list[Node]:
+        """Get detailed info for all nodes in a single bulk request."""
+        nodes_raw = await self.api_client.get(self.ENDPOINT, bulk=1)
+        return [dict_to_dataclass(Node, node_raw) for node_raw in nodes_raw]
+
+    async def get_partial_nodes(self, fields: Sequence[str]) -> list[Record]:
+        """Get only the given fields (e.g. ``["name", "mfree", "dfree"]``) for all nodes."""
+        nodes_raw = await self.api_client.get(self.ENDPOINT, bulk=1, fields=",".join(fields))
+        return [Record(normalize_keys(node_raw)) for node_raw in nodes_raw]
+
+    async def get_node(self, node_name: str) -> Node:
+        node_info_raw = await self.api_client.get(f"{self.ENDPOINT}/{node_name}")
+        return dict_to_dataclass(Node, node_info_raw)
@@ -1,8 +1,14 @@
+import threading
+import time
 import types
-from typing import Any
+from collections.abc import Iterator, Sequence
+from typing import Any, Optional, Protocol, Union
 
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
+from client.cache import ResponseCache
 from client.exceptions import (
     AuthenticationError,
     AuthorizationError,
@@ -12,24 +18,106 @@ from client.exceptions import (
     ResourceNotFoundError,
     ServerError,
 )
+from client.instrumentation import RequestEvent, RequestHook, endpoint_template
+from client.rate_limit import RateLimiter
+from client.retry import RetryPolicy
+from client.utils import iter_json_array
+
+_MISSING = object()
+
+
+class _Response(Protocol):
+    """The parts of a response needed for error handling, shared by requests and httpx."""
+
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def text(self) -> str: ...
+
+    def json(self, **kwargs: Any) -> Any: ...
 
 
 class BaseApiClient:
+    """Low level client for the Ganeti RAPI.
+
+    A single client can be shared between threads. Connections to the master are kept alive and
+    reused from a pool; ``pool_maxsize`` limits the connections per host and should be at least the
+    number of threads sharing the client, otherwise surplus connections are closed after use (or,
+    with ``pool_block``, threads wait for a free connection). ``pool_connections`` is the number of
+    hosts whose pools are kept. With ``keep_alive=False`` every request uses a new connection.
+
+    Failed requests are retried according to ``retry_policy``, which can be overridden per call.
+    Without a policy every error is raised immediately.
+
+    With a ``cache`` GET responses are served from it until they expire or a mutating request
+    touches the same resource, see ResponseCache.
+
+    ``rapi_address`` may be a list of the addresses of all master candidates. Requests go to the
+    last known master; when it can't be reached (or redirects), the candidates are probed via
+    ``/2/info`` and the request is repeated on the new master. Requests other than GET are only
+    repeated if the connection could not be established, as they may have been processed already.
+
+    A ``rate_limiter`` caps the request rate and the number of concurrent requests of all threads
+    using the client, with separate budgets for reads and writes; every retry counts as a request.
+
+    ``transport`` replaces the adapter sending the requests, e.g. a RecordingAdapter saving the
+    responses or a ReplayAdapter answering from a recording; the pool settings then don't apply.
+
+    ``request_hooks`` are called with a RequestEvent after every HTTP request, e.g. a
+    MetricsCollector. They run in the requesting thread and should return quickly. Without hooks
+    requests are not timed.
+    """
+
     _ERROR_MAP = {400: BadRequestError, 401: AuthenticationError, 403: AuthorizationError, 404: ResourceNotFoundError}
 
-    def __init__(self, rapi_address: str, username: str, password: str, ssl_verify: bool = True, timeout: int = 10):
-        self.base_url = f"https://{rapi_address}/2"
+    def __init__(
+        self,
+        rapi_address: Union[str, Sequence[str]],
+        username: str,
+        password: str,
+        ssl_verify: bool = True,
+        timeout: float = 10,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_hooks: Optional[Sequence[RequestHook]] = None,
+        transport: Optional[BaseAdapter] = None,
+    ):
+        self.rapi_addresses = [rapi_address] if isinstance(rapi_address, str) else list(rapi_address)
+        if not self.rapi_addresses:
+            raise ValueError("At least one RAPI address is required")
+        self.master_address = self.rapi_addresses[0]
+        self._failover_lock = threading.Lock()
         self.username = username
         self.password = password
         self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._request_hooks: list[RequestHook] = list(request_hooks or ())
         self._session = requests.Session()
+        if transport is None:
+            transport = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self._session.mount("https://", transport)
 
         self._session.auth = (self.username, self.password)
         self._session.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
 
         self._session.verify = ssl_verify
 
-    def _handle_error_response(self, response: requests.Response, url: str) -> None:
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.master_address}/2"
+
+    @classmethod
+    def _handle_error_response(cls, response: _Response, url: str) -> None:
         """Handle an error response from the API."""
         status_code = response.status_code
         try:
@@ -41,8 +129,8 @@ class BaseApiClient:
         except Exception:
             error_message = response.text or f"HTTP {status_code} Error"
 
-        if status_code in self._ERROR_MAP:
-            raise self._ERROR_MAP[status_code](
+        if status_code in cls._ERROR_MAP:
+            raise cls._ERROR_MAP[status_code](
                 message=error_message,
                 status_code=status_code,
                 url=url,
@@ -59,28 +147,194 @@ class BaseApiClient:
             url=url,
         )
 
-    def _request(self, method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    def _request(
+        self, method: str, endpoint: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any
+    ) -> requests.Response:
         try:
-            response = self._session.request(method, f"{self.base_url}/{endpoint}", **kwargs)
-        except requests.exceptions.RequestException as e:
-            raise GanetiRAPIClientError(f"Client Error: {e}") from e
+            return self._send(method, endpoint, retry_policy or self.retry_policy, **kwargs)
+        finally:
+            if self.cache is not None and method != "GET":
+                self.cache.invalidate(endpoint)
 
-        if not response.ok:
-            self._handle_error_response(response, f"{self.base_url}/{endpoint}")
+    def _send(self, method: str, endpoint: str, policy: Optional[RetryPolicy], **kwargs: Any) -> requests.Response:
+        if len(self.rapi_addresses) > 1:
+            kwargs.setdefault("allow_redirects", False)
+        attempt = 1
+        failovers = 0
+        while True:
+            address = self.master_address
+            url = f"https://{address}/2/{endpoint}"
+            try:
+                if self._request_hooks:
+                    response = self._send_instrumented(method, endpoint, address, attempt + failovers, **kwargs)
+                else:
+                    response = self._send_once(method, endpoint, address, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if (
+                    failovers < len(self.rapi_addresses)
+                    and self._is_failover_error(method, e)
+                    and self._fail_over(address)
+                ):
+                    failovers += 1
+                    continue
+                if policy is None or not (policy.can_retry(method, attempt) and policy.is_retryable_exception(e)):
+                    raise GanetiRAPIClientError(f"Client Error: {e}") from e
+                delay = policy.get_backoff(attempt)
+            else:
+                if len(self.rapi_addresses) > 1 and response.is_redirect:
+                    if failovers < len(self.rapi_addresses) and self._fail_over(address):
+                        failovers += 1
+                        continue
+                    self._handle_error_response(response, url)
+                if response.ok:
+                    return response
+                if policy is None or not (policy.can_retry(method, attempt) and policy.is_retryable_response(response)):
+                    self._handle_error_response(response, url)
+                    return response
+                delay = policy.get_backoff(attempt, response)
+            time.sleep(delay)
+            attempt += 1
 
+    def _send_once(self, method: str, endpoint: str, address: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"https://{address}/2/{endpoint}"
+        if self.rate_limiter is None:
+            return self._session.request(method, url, **kwargs)
+        with self.rate_limiter.limit(method, endpoint):
+            return self._session.request(method, url, **kwargs)
+
+    def _send_instrumented(
+        self, method: str, endpoint: str, address: str, attempt: int, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        event = RequestEvent(method, endpoint, endpoint_template(endpoint), address, attempt, 0.0)
+        try:
+            response = self._send_once(method, endpoint, address, **kwargs)
+        except requests.exceptions.RequestException as e:
+            event.duration = time.perf_counter() - start
+            event.error = e
+            self._call_request_hooks(event)
+            raise
+        event.duration = time.perf_counter() - start
+        event.time_to_headers = response.elapsed.total_seconds()
+        event.status_code = response.status_code
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None:
+            event.response_bytes = int(content_length)
+        elif not kwargs.get("stream"):
+            event.response_bytes = len(response.content)
+        self._call_request_hooks(event)
         return response
 
-    def get(self, endpoint: str, **kwargs: Any) -> Any:
-        return self._request("GET", endpoint, params=kwargs).json()
+    def _call_request_hooks(self, event: RequestEvent) -> None:
+        for hook in self._request_hooks:
+            hook(event)
+
+    def add_request_hook(self, hook: RequestHook) -> None:
+        self._request_hooks.append(hook)
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        self._request_hooks.remove(hook)
+
+    @staticmethod
+    def _is_failover_error(method: str, exc: requests.exceptions.RequestException) -> bool:
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(exc, requests.exceptions.ConnectionError):
+            return False
+        if method == "GET":
+            return True
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _fail_over(self, failed_address: str) -> bool:
+        """Find the master after ``failed_address`` failed, return whether to repeat the request."""
+        if len(self.rapi_addresses) < 2:
+            return False
+        with self._failover_lock:
+            if self.master_address != failed_address:
+                # another thread found the new master in the meantime
+                return True
+            master_address = self._discover_master(failed_address)
+            if master_address is None:
+                return False
+            self.master_address = master_address
+            return True
+
+    def _discover_master(self, failed_address: str) -> Optional[str]:
+        # the failed address is probed last as it may have been a transient error
+        candidates = [address for address in self.rapi_addresses if address != failed_address] + [failed_address]
+        for address in candidates:
+            try:
+                response = self._session.request(
+                    "GET", f"https://{address}/2/info", timeout=self.timeout, allow_redirects=False
+                )
+            except requests.exceptions.RequestException:
+                continue
+            if not response.ok or response.is_redirect:
+                continue
+            master = response.json().get("master", "")
+            # prefer the candidate named as master by the cluster, e.g. during a master role change
+            for candidate in candidates:
+                host = candidate.rsplit(":", 1)[0]
+                if master == host or master.startswith(f"{host}."):
+                    return candidate
+            return address
+        return None
+
+    def get(self, endpoint: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any) -> Any:
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, kwargs, _MISSING)
+            if cached is not _MISSING:
+                return cached
+        result = self._request("GET", endpoint, retry_policy=retry_policy, params=kwargs).json()
+        if self.cache is not None:
+            self.cache.set(endpoint, kwargs, result)
+        return result
+
+    def iter_get(
+        self, endpoint: str, retry_policy: Optional[RetryPolicy] = None, chunk_size: int = 65536, **kwargs: Any
+    ) -> Iterator[Any]:
+        """GET a JSON array and yield its items while the response is received.
+
+        The request is sent when iteration starts. Responses are not cached.
+        """
+        response = self._request("GET", endpoint, retry_policy=retry_policy, params=kwargs, stream=True)
+        with response:
+            try:
+                yield from iter_json_array(response.iter_content(chunk_size))
+            except requests.exceptions.RequestException as e:
+                raise GanetiRAPIClientError(f"Client Error: {e}") from e
+
+    def get_with_body(
+        self,
+        endpoint: str,
+        retry_policy: Optional[RetryPolicy] = None,
+        min_timeout: float = 0,
+        **kwargs: Any,
+    ) -> Any:
+        """GET with the arguments sent as JSON body, as expected by e.g. ``jobs/<id>/wait``.
+
+        ``min_timeout`` raises the client's timeout for requests the master answers late.
+        """
+        timeout = max(self.timeout, min_timeout)
+        return self._request("GET", endpoint, retry_policy=retry_policy, json=dict(kwargs), timeout=timeout).json()
+
+    def post(self, endpoint: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any) -> Any:
+        return self._request("POST", endpoint, retry_policy=retry_policy, json=dict(kwargs)).json()
+
+    def put(self, endpoint: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any) -> Any:
+        return self._request("PUT", endpoint, retry_policy=retry_policy, json=dict(kwargs)).json()
 
-    def post(self, endpoint: str, **kwargs: Any) -> Any:
-        return self._request("POST", endpoint, json=dict(kwargs)).json()
+    def put_value(self, endpoint: str, value: Any, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any) -> Any:
+        """PUT a single JSON value as body, as expected by e.g. ``nodes/<name>/role``.
 
-    def put(self, endpoint: str, **kwargs: Any) -> Any:
-        return self._request("PUT", endpoint, json=dict(kwargs)).json()
+        Keyword arguments are sent as query parameters.
+        """
+        return self._request("PUT", endpoint, retry_policy=retry_policy, json=value, params=kwargs).json()
 
-    def delete(self, endpoint: str) -> Any:
-        return self._request("DELETE", endpoint).json()
+    def delete(self, endpoint: str, retry_policy: Optional[RetryPolicy] = None) -> Any:
+        return self._request("DELETE", endpoint, retry_policy=retry_policy).json()
 
     def close(self) -> None:
         """Close the session and cleanup."""
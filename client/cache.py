@@ -0,0 +1,140 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from client.instrumentation import endpoint_template
+
+# only listings and objects are cached; e.g. instances/{name}/info submits a job on every GET
+DEFAULT_TTLS: Mapping[str, float] = {"instances": 5.0, "instances/{name}": 5.0, "nodes": 5.0, "nodes/{name}": 5.0}
+
+# collections whose listings change with requests to another collection
+_COLLECTIONS = {"instances-multi-alloc": "instances"}
+# requests changing objects of another collection than their own, all of them are dropped
+_AFFECTED_COLLECTIONS = {
+    "nodes/{name}/evacuate": "instances",
+    "nodes/{name}/migrate": "instances",
+}
+
+_CacheKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires: float
+    serial_no: Optional[int]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache for GET responses.
+
+    Only endpoints whose template (see endpoint_template) is in ``ttls`` are cached, each for the
+    TTL in seconds of its template, e.g. ``{"nodes": 30, "instances/{name}": 5}``. Don't add
+    templates like ``instances/{name}/info``, whose GET submits a job.
+    The cache holds at most ``maxsize`` responses and returns copies, so callers may modify them.
+
+    Mutating requests invalidate the affected resource and the listings of its collection. As
+    Ganeti applies changes asynchronously in jobs, entries fetched while a job is running can still
+    be outdated; the TTL bounds how long such entries are served. Entries carry the ``serial_no``
+    of the object where the response contains one, and are dropped as soon as a listing shows a
+    different ``serial_no`` for that object.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttls: Optional[Mapping[str, float]] = None):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: OrderedDict[_CacheKey, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_ttl(self, endpoint: str) -> float:
+        """Return the TTL for an endpoint, 0 if it isn't cached."""
+        return self.ttls.get(endpoint_template(endpoint.strip("/")), 0.0)
+
+    def get(self, endpoint: str, params: Mapping[str, Any], default: Any = None) -> Any:
+        key = _make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry.value)
+
+    def set(self, endpoint: str, params: Mapping[str, Any], value: Any) -> None:
+        ttl = self.get_ttl(endpoint)
+        if ttl <= 0:
+            return
+        serial_no = value.get("serial_no") if isinstance(value, dict) else None
+        entry = _CacheEntry(copy.deepcopy(value), time.monotonic() + ttl, serial_no)
+        with self._lock:
+            if isinstance(value, list):
+                self._drop_stale_objects(endpoint, value)
+            key = _make_key(endpoint, params)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def is_stale(self, endpoint: str, serial_no: int) -> bool:
+        """Check if a cached object differs from the given ``serial_no``."""
+        with self._lock:
+            return any(
+                entry.serial_no is not None and entry.serial_no != serial_no
+                for (cached_endpoint, _), entry in self._entries.items()
+                if cached_endpoint == endpoint
+            )
+
+    def invalidate(self, endpoint: str) -> None:
+        """Drop cached responses affected by a change of the resource at ``endpoint``.
+
+        For ``instances/foo/modify`` these are all responses below ``instances/foo`` and the
+        listings of ``instances``. ``instances-multi-alloc`` drops the listings of ``instances``,
+        evacuating or migrating a node all cached instances.
+        """
+        endpoint = endpoint.strip("/")
+        segments = endpoint.split("/")
+        collection = _COLLECTIONS.get(segments[0], segments[0])
+        resource = "/".join(segments[:2])
+        affected = _AFFECTED_COLLECTIONS.get(endpoint_template(endpoint))
+        with self._lock:
+            for key in list(self._entries):
+                if (
+                    key[0] == collection
+                    or _is_below(key[0], resource)
+                    or (affected is not None and _is_below(key[0], affected))
+                ):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop_stale_objects(self, endpoint: str, objects: list[Any]) -> None:
+        serial_nos = {
+            f"{endpoint}/{obj['name']}": obj["serial_no"]
+            for obj in objects
+            if isinstance(obj, dict) and "name" in obj and "serial_no" in obj
+        }
+        if not serial_nos:
+            return
+        for key, entry in list(self._entries.items()):
+            if key[0] in serial_nos and entry.serial_no not in (None, serial_nos[key[0]]):
+                del self._entries[key]
+
+
+def _make_key(endpoint: str, params: Mapping[str, Any]) -> _CacheKey:
+    return endpoint.strip("/"), tuple(sorted(params.items()))
+
+
+def _is_below(endpoint: str, prefix: str) -> bool:
+    endpoint = endpoint.strip("/")
+    return endpoint == prefix or endpoint.startswith(f"{prefix}/")
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from client.cluster_index import ClusterIndex
+from client.models.instance import DISK_TEMPLATES_EXT_MIRROR, DISK_TEMPLATES_INT_MIRROR, InstanceInfo
+from client.models.node import NODE_EVAC_ALL, NODE_EVAC_PRIMARY, NODE_EVAC_SECONDARY
+
+
+@dataclass
+class EvacuationPlan:
+    """Estimated outcome of evacuating a node, see plan_evacuation.
+
+    ``placements`` maps the moved instances to their estimated new primary (for primary
+    instances) or secondary node (for secondary instances); ``secondary_placements`` maps
+    mirrored primaries that fail over in ``all`` mode to the node receiving their new secondary.
+    ``unplaced`` instances don't fit anywhere in the group or can't be relocated at all.
+    """
+
+    node_name: str
+    mode: str
+    memory_required: int = 0
+    disk_required: int = 0
+    memory_available: int = 0
+    disk_available: int = 0
+    placements: dict[str, str] = field(default_factory=dict)
+    secondary_placements: dict[str, str] = field(default_factory=dict)
+    unplaced: list[str] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return not self.unplaced
+
+
+def plan_evacuation(index: ClusterIndex, node_name: str, mode: str = NODE_EVAC_ALL) -> EvacuationPlan:
+    """Estimate whether the instances of a node fit on the other nodes of its group.
+
+    Works on the index only, without requests. DRBD primaries fail over to their secondary node,
+    which needs the memory of the instance; in ``all`` mode their secondary, still on the
+    evacuated node, moves to a third node. Primaries on shared storage need memory only, DRBD
+    secondaries disk only; both are placed largest first on the node of the group with the most
+    free memory (or disk) that can take them. Instances with local disks (``plain``, ``file``)
+    can't be relocated by Ganeti and are unplaced. The estimate ignores the cluster's instance
+    policy and N+1 redundancy, so the iallocator may still refuse an evacuation that fits here.
+    """
+    node = index.nodes[node_name]
+    plan = EvacuationPlan(node_name, mode)
+    targets = {
+        target.name: [target.mfree or 0, target.dfree or 0]
+        for target in index.get_group_nodes(node.group_uuid)
+        if target.name != node_name and not (target.offline or target.drained) and target.vm_capable
+    }
+    plan.memory_available = sum(free[0] for free in targets.values())
+    plan.disk_available = sum(free[1] for free in targets.values())
+
+    if mode in (NODE_EVAC_PRIMARY, NODE_EVAC_ALL):
+        primaries = sorted(index.get_primary_instances(node_name), key=_size, reverse=True)
+        for instance in primaries:
+            plan.memory_required += instance.beparams.memory
+            if instance.disk_template in DISK_TEMPLATES_INT_MIRROR:
+                _fail_over(plan, targets, instance, move_secondary=mode == NODE_EVAC_ALL)
+            elif instance.disk_template in DISK_TEMPLATES_EXT_MIRROR:
+                target_name = _find_target(targets, instance.beparams.memory, 0, exclude=())
+                if target_name is None:
+                    plan.unplaced.append(instance.name)
+                    continue
+                targets[target_name][0] -= instance.beparams.memory
+                plan.placements[instance.name] = target_name
+            else:
+                # node-evacuate refuses instances with local disks
+                plan.unplaced.append(instance.name)
+
+    if mode in (NODE_EVAC_SECONDARY, NODE_EVAC_ALL):
+        secondaries = sorted(index.get_secondary_instances(node_name), key=_size, reverse=True)
+        for instance in secondaries:
+            plan.disk_required += instance.disk_usage
+            # the new secondary must not be the primary node of the instance
+            target_name = _find_target(targets, 0, instance.disk_usage, exclude=(instance.pnode,))
+            if target_name is None:
+                plan.unplaced.append(instance.name)
+                continue
+            targets[target_name][1] -= instance.disk_usage
+            plan.placements[instance.name] = target_name
+
+    return plan
+
+
+def _size(instance: InstanceInfo) -> tuple[int, int]:
+    return instance.beparams.memory, instance.disk_usage
+
+
+def _fail_over(
+    plan: EvacuationPlan, targets: dict[str, list[int]], instance: InstanceInfo, move_secondary: bool
+) -> None:
+    """Place a DRBD primary on its secondary node and, if requested, its new secondary."""
+    # the disks are already on the secondary node
+    target_name = instance.snodes[0] if instance.snodes else None
+    free = targets.get(target_name) if target_name is not None else None
+    if target_name is None or free is None or free[0] < instance.beparams.memory:
+        plan.unplaced.append(instance.name)
+        return
+    secondary_name = None
+    if move_secondary:
+        plan.disk_required += instance.disk_usage
+        secondary_name = _find_target(targets, 0, instance.disk_usage, exclude=(target_name,))
+        if secondary_name is None:
+            plan.unplaced.append(instance.name)
+            return
+        targets[secondary_name][1] -= instance.disk_usage
+        plan.secondary_placements[instance.name] = secondary_name
+    free[0] -= instance.beparams.memory
+    plan.placements[instance.name] = target_name
+
+
+def _find_target(targets: dict[str, list[int]], memory: int, disk: int, exclude: tuple[str, ...]) -> Optional[str]:
+    candidates = [
+        name for name, (mfree, dfree) in targets.items() if name not in exclude and mfree >= memory and dfree >= disk
+    ]
+    if not candidates:
+        return None
+    # memory is the scarcer resource for primaries, disk for secondaries
+    return max(candidates, key=lambda name: (targets[name][0] if memory else targets[name][1], name))
@@ -0,0 +1,218 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Optional
+
+from client.api_client import BaseApiClient
+from client.models.instance import InstanceInfo
+from client.models.node import Node
+from client.services.instance_service import InstanceService
+from client.services.node_service import NodeService
+from client.snapshot import ClusterSnapshot, SnapshotChanges
+
+
+@dataclass
+class NodeCapacity:
+    """Resources of a node and the memory and vcpus committed to its primary instances.
+
+    Values the RAPI doesn't report (e.g. for offline nodes) are 0.
+    """
+
+    name: str
+    mtotal: int = 0
+    mfree: int = 0
+    dtotal: int = 0
+    dfree: int = 0
+    ctotal: int = 0
+    committed_memory: int = 0
+    committed_vcpus: int = 0
+    primary_instances: int = 0
+    secondary_instances: int = 0
+
+
+@dataclass
+class GroupCapacity:
+    """Sum of the capacities of all nodes of a node group."""
+
+    group_uuid: str
+    nodes: int = 0
+    mtotal: int = 0
+    mfree: int = 0
+    dtotal: int = 0
+    dfree: int = 0
+    ctotal: int = 0
+    committed_memory: int = 0
+    committed_vcpus: int = 0
+
+
+class ClusterIndex:
+    """Nodes and instances of a cluster indexed for lookups by name, uuid, node, group and tag.
+
+    Instance placement is taken from the instances (``pnode``, ``snodes``), so the index stays
+    consistent when only instances are updated. Lookups take constant time, plus the size of the
+    result. The index is updated with put/remove or ``apply`` and is not thread-safe.
+    """
+
+    def __init__(self, nodes: Iterable[Node] = (), instances: Iterable[InstanceInfo] = ()):
+        self.nodes: dict[str, Node] = {}
+        self.instances: dict[str, InstanceInfo] = {}
+        self._nodes_by_uuid: dict[str, Node] = {}
+        self._instances_by_uuid: dict[str, InstanceInfo] = {}
+        self._nodes_by_group: defaultdict[str, set[str]] = defaultdict(set)
+        self._nodes_by_tag: defaultdict[str, set[str]] = defaultdict(set)
+        self._instances_by_pnode: defaultdict[str, set[str]] = defaultdict(set)
+        self._instances_by_snode: defaultdict[str, set[str]] = defaultdict(set)
+        self._instances_by_tag: defaultdict[str, set[str]] = defaultdict(set)
+        self._committed_memory: defaultdict[str, int] = defaultdict(int)
+        self._committed_vcpus: defaultdict[str, int] = defaultdict(int)
+        for node in nodes:
+            self.put_node(node)
+        for instance in instances:
+            self.put_instance(instance)
+
+    @classmethod
+    def from_api_client(cls, api_client: BaseApiClient) -> "ClusterIndex":
+        """Index the cluster with one bulk request for the nodes and one for the instances."""
+        return cls(NodeService(api_client).get_nodes(), InstanceService(api_client).get_instances())
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ClusterSnapshot) -> "ClusterIndex":
+        """Index the objects of a snapshot; keep it current by applying the changes of its refreshes.
+
+        Free memory and disk of the nodes are as current as the last refresh, see ClusterSnapshot.
+        """
+        return cls(snapshot.nodes.values(), snapshot.instances.values())
+
+    def apply(self, changes: SnapshotChanges) -> None:
+        """Update the index with the changes returned by ClusterSnapshot.refresh."""
+        for name in changes.nodes.removed:
+            self.remove_node(name)
+        for node in changes.nodes.added + changes.nodes.changed:
+            self.put_node(node)
+        for name in changes.instances.removed:
+            self.remove_instance(name)
+        for instance in changes.instances.added + changes.instances.changed:
+            self.put_instance(instance)
+
+    def put_node(self, node: Node) -> None:
+        """Add a node or replace the node with the same name."""
+        self.remove_node(node.name)
+        self.nodes[node.name] = node
+        self._nodes_by_uuid[node.uuid] = node
+        self._nodes_by_group[node.group_uuid].add(node.name)
+        for tag in node.tags:
+            self._nodes_by_tag[tag].add(node.name)
+
+    def remove_node(self, name: str) -> None:
+        node = self.nodes.pop(name, None)
+        if node is None:
+            return
+        del self._nodes_by_uuid[node.uuid]
+        _discard(self._nodes_by_group, node.group_uuid, name)
+        for tag in node.tags:
+            _discard(self._nodes_by_tag, tag, name)
+
+    def put_instance(self, instance: InstanceInfo) -> None:
+        """Add an instance or replace the instance with the same name."""
+        self.remove_instance(instance.name)
+        self.instances[instance.name] = instance
+        self._instances_by_uuid[instance.uuid] = instance
+        self._instances_by_pnode[instance.pnode].add(instance.name)
+        for snode in instance.snodes:
+            self._instances_by_snode[snode].add(instance.name)
+        for tag in instance.tags:
+            self._instances_by_tag[tag].add(instance.name)
+        self._committed_memory[instance.pnode] += instance.beparams.memory
+        self._committed_vcpus[instance.pnode] += instance.beparams.vcpus
+
+    def remove_instance(self, name: str) -> None:
+        instance = self.instances.pop(name, None)
+        if instance is None:
+            return
+        del self._instances_by_uuid[instance.uuid]
+        _discard(self._instances_by_pnode, instance.pnode, name)
+        for snode in instance.snodes:
+            _discard(self._instances_by_snode, snode, name)
+        for tag in instance.tags:
+            _discard(self._instances_by_tag, tag, name)
+        self._committed_memory[instance.pnode] -= instance.beparams.memory
+        self._committed_vcpus[instance.pnode] -= instance.beparams.vcpus
+
+    def get_node(self, name: str) -> Optional[Node]:
+        return self.nodes.get(name)
+
+    def get_instance(self, name: str) -> Optional[InstanceInfo]:
+        return self.instances.get(name)
+
+    def get_node_by_uuid(self, uuid: str) -> Optional[Node]:
+        return self._nodes_by_uuid.get(uuid)
+
+    def get_instance_by_uuid(self, uuid: str) -> Optional[InstanceInfo]:
+        return self._instances_by_uuid.get(uuid)
+
+    def get_primary_instances(self, node_name: str) -> list[InstanceInfo]:
+        """Instances running on the node."""
+        return [self.instances[name] for name in sorted(self._instances_by_pnode.get(node_name, ()))]
+
+    def get_secondary_instances(self, node_name: str) -> list[InstanceInfo]:
+        """Instances with the node as secondary."""
+        return [self.instances[name] for name in sorted(self._instances_by_snode.get(node_name, ()))]
+
+    def get_secondary_peers(self, node_name: str) -> set[str]:
+        """Names of the nodes sharing an instance with the node, as its primary or secondary."""
+        peers: set[str] = set()
+        for name in self._instances_by_pnode.get(node_name, ()):
+            peers.update(self.instances[name].snodes)
+        for name in self._instances_by_snode.get(node_name, ()):
+            peers.add(self.instances[name].pnode)
+        peers.discard(node_name)
+        return peers
+
+    def get_group_nodes(self, group_uuid: str) -> list[Node]:
+        return [self.nodes[name] for name in sorted(self._nodes_by_group.get(group_uuid, ()))]
+
+    def get_tagged_nodes(self, tag: str) -> list[Node]:
+        return [self.nodes[name] for name in sorted(self._nodes_by_tag.get(tag, ()))]
+
+    def get_tagged_instances(self, tag: str) -> list[InstanceInfo]:
+        return [self.instances[name] for name in sorted(self._instances_by_tag.get(tag, ()))]
+
+    def get_node_capacity(self, node_name: str) -> NodeCapacity:
+        """Capacity of a node; raises KeyError for unknown nodes."""
+        node = self.nodes[node_name]
+        return NodeCapacity(
+            name=node_name,
+            mtotal=node.mtotal or 0,
+            mfree=node.mfree or 0,
+            dtotal=node.dtotal or 0,
+            dfree=node.dfree or 0,
+            ctotal=node.ctotal or 0,
+            committed_memory=self._committed_memory.get(node_name, 0),
+            committed_vcpus=self._committed_vcpus.get(node_name, 0),
+            primary_instances=len(self._instances_by_pnode.get(node_name, ())),
+            secondary_instances=len(self._instances_by_snode.get(node_name, ())),
+        )
+
+    def get_group_capacity(self, group_uuid: str) -> GroupCapacity:
+        """Capacity of a node group, summed over its nodes."""
+        capacity = GroupCapacity(group_uuid)
+        for name in self._nodes_by_group.get(group_uuid, ()):
+            node_capacity = self.get_node_capacity(name)
+            capacity.nodes += 1
+            capacity.mtotal += node_capacity.mtotal
+            capacity.mfree += node_capacity.mfree
+            capacity.dtotal += node_capacity.dtotal
+            capacity.dfree += node_capacity.dfree
+            capacity.ctotal += node_capacity.ctotal
+            capacity.committed_memory += node_capacity.committed_memory
+            capacity.committed_vcpus += node_capacity.committed_vcpus
+        return capacity
+
+
+def _discard(index: defaultdict[str, set[str]], key: str, name: str) -> None:
+    names = index.get(key)
+    if names is None:
+        return
+    names.discard(name)
+    if not names:
+        del index[key]
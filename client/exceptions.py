@@ -1,3 +1,6 @@
+from typing import Any
+
+
 class GanetiRAPIError(Exception):
     """Base exception for Ganeti API errors."""
 
@@ -30,3 +33,13 @@ class ServerError(GanetiRAPIError):
 
 class GanetiRAPIClientError(Exception):
     """Base exception for Ganeti RAPI client errors."""
+
+
+class JobFailedError(GanetiRAPIClientError):
+    """Raised when the result of a job is needed but the job did not succeed."""
+
+    def __init__(self, job_id: int, status: str, opresult: list[Any]):
+        super().__init__(f"Job {job_id} finished with status {status}: {opresult}")
+        self.job_id = job_id
+        self.status = status
+        self.opresult = opresult
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, TypeVar, Union
+
+from client import GanetiRapiClient
+from client.models.instance import InstanceInfo
+
+T = TypeVar("T")
+
+
+@dataclass
+class ClusterResult(Generic[T]):
+    """Outcome of a call on one cluster: either ``value`` or ``error`` is set."""
+
+    cluster: str
+    value: Optional[T] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FleetClient:
+    """Run the same call against many Ganeti clusters in parallel.
+
+    At most ``max_workers`` clusters are queried at the same time. A cluster whose call takes
+    longer than ``timeout`` seconds from its start gets a TimeoutError result; its thread is
+    abandoned and finishes in the background while the next cluster starts. Clients created by
+    from_addresses also use ``timeout`` for every HTTP request, so abandoned threads end too.
+    """
+
+    def __init__(self, clients: Mapping[str, GanetiRapiClient], max_workers: int = 8, timeout: Optional[float] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.clients = dict(clients)
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    @classmethod
+    def from_addresses(
+        cls,
+        addresses: Mapping[str, Union[str, Sequence[str]]],
+        username: str,
+        password: str,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> "FleetClient":
+        """Create a client per cluster from a mapping of cluster name to RAPI address(es)."""
+        if timeout is not None:
+            kwargs.setdefault("timeout", timeout)
+        clients = {name: GanetiRapiClient(address, username, password, **kwargs) for name, address in addresses.items()}
+        return cls(clients, max_workers=max_workers, timeout=timeout)
+
+    def run(
+        self, func: Callable[[GanetiRapiClient], T], timeout: Optional[float] = None
+    ) -> dict[str, ClusterResult[T]]:
+        """Call ``func`` with the client of every cluster and return the results by cluster name."""
+        timeout = self.timeout if timeout is None else timeout
+        results: dict[str, ClusterResult[T]] = {}
+        queued = deque(self.clients.items())
+        # running calls with their cluster and start time
+        running: dict[Future[T], tuple[str, float]] = {}
+        while queued or running:
+            while queued and len(running) < self.max_workers:
+                cluster, client = queued.popleft()
+                running[self._start(func, client)] = (cluster, time.monotonic())
+            done, _ = wait(running, timeout=self._next_wait(running, timeout), return_when=FIRST_COMPLETED)
+            for future in done:
+                cluster, _ = running.pop(future)
+                try:
+                    results[cluster] = ClusterResult(cluster, value=future.result())
+                except Exception as e:
+                    results[cluster] = ClusterResult(cluster, error=e)
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for future, (cluster, started) in list(running.items()):
+                if now - started >= timeout:
+                    # abandon the call, its thread no longer counts against max_workers
+                    del running[future]
+                    results[cluster] = ClusterResult(
+                        cluster, error=TimeoutError(f"Cluster {cluster} timed out after {timeout} seconds")
+                    )
+
+        return {cluster: results[cluster] for cluster in self.clients}
+
+    @staticmethod
+    def _start(func: Callable[[GanetiRapiClient], T], client: GanetiRapiClient) -> "Future[T]":
+        """Call ``func`` in a daemon thread, so abandoned calls don't delay the exit of the interpreter."""
+        future: Future[T] = Future()
+
+        def _call() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(func(client))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_call, name="fleet", daemon=True).start()
+        return future
+
+    @staticmethod
+    def _next_wait(running: dict["Future[T]", tuple[str, float]], timeout: Optional[float]) -> Optional[float]:
+        if timeout is None:
+            return None
+        deadline = min(started for _, started in running.values()) + timeout
+        return max(deadline - time.monotonic(), 0.0)
+
+    def get_instances(self) -> dict[str, ClusterResult[list[InstanceInfo]]]:
+        """Get all instances of all clusters, one bulk request per cluster."""
+        return self.run(lambda client: client.instance_service.get_instances())
+
+    def find_instance(self, instance_name: str) -> dict[str, ClusterResult[bool]]:
+        """Check on which clusters an instance exists."""
+        return self.run(lambda client: instance_name in client.instance_service.get_instance_names())
+
+    def close(self) -> None:
+        for client in self.clients.values():
+            client.close()
@@ -0,0 +1,127 @@
+import math
+import re
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+# placeholders for the path segment following a resource, e.g. instances/{name}
+_NAMED_RESOURCES = {
+    "instances": "{name}",
+    "nodes": "{name}",
+    "groups": "{name}",
+    "networks": "{name}",
+    "jobs": "{job_id}",
+    "filters": "{uuid}",
+}
+_DISK_INDEX = re.compile(r"^disk/\d+/")
+
+
+@dataclass
+class RequestEvent:
+    """A HTTP request sent to the RAPI, passed to the request hooks of BaseApiClient.
+
+    ``duration`` is the time in seconds until the response was received (for streamed responses
+    until the headers were received), ``time_to_headers`` the part of it measured by requests from
+    sending the request until the response headers were parsed. ``attempt`` counts the retries
+    and failovers of the same call, starting with 1. ``status_code`` and ``response_bytes`` are
+    None if no response was received, then ``error`` is set.
+    """
+
+    method: str
+    endpoint: str
+    endpoint_template: str
+    address: str
+    attempt: int
+    duration: float
+    time_to_headers: Optional[float] = None
+    status_code: Optional[int] = None
+    response_bytes: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(endpoint: str) -> str:
+    """Replace the object names of an endpoint by placeholders.
+
+    >>> endpoint_template("instances/vm1.example.com/disk/0/grow")
+    'instances/{name}/disk/{index}/grow'
+    """
+    resource, sep, rest = endpoint.partition("/")
+    placeholder = _NAMED_RESOURCES.get(resource)
+    if placeholder is None or not rest:
+        return endpoint
+    _, sep2, action = rest.partition("/")
+    action = _DISK_INDEX.sub("disk/{index}/", action)
+    return f"{resource}{sep}{placeholder}{sep2}{action}"
+
+
+class _EndpointStats:
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.response_bytes = 0
+        self.durations: deque[float] = deque(maxlen=max_samples)
+
+
+class MetricsCollector:
+    """Request hook collecting counts and latency percentiles per endpoint template.
+
+    Percentiles are computed from the last ``max_samples`` requests of every endpoint. Register it
+    with ``BaseApiClient.add_request_hook(collector)``.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self._stats: dict[tuple[str, str], _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint_template)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats(self.max_samples)
+            stats.count += 1
+            if event.error is not None or (event.status_code is not None and event.status_code >= 400):
+                stats.errors += 1
+            stats.total_time += event.duration
+            stats.response_bytes += event.response_bytes or 0
+            stats.durations.append(event.duration)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics by ``"<method> <endpoint template>"``, durations in seconds."""
+        with self._lock:
+            items = [
+                (key, stats.count, stats.errors, stats.total_time, stats.response_bytes, sorted(stats.durations))
+                for key, stats in self._stats.items()
+            ]
+        return {
+            f"{method} {template}": {
+                "count": count,
+                "errors": errors,
+                "mean": total_time / count,
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+                "p99": _percentile(durations, 99),
+                "max": durations[-1],
+                "response_bytes": response_bytes,
+            }
+            for (method, template), count, errors, total_time, response_bytes, durations in sorted(items)
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
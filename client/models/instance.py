@@ -1,7 +1,68 @@
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional
 
+from client.utils import with_slots
 
+# RAPI names of the InstanceInfo fields
+INSTANCE_FIELDS = [
+    "name",
+    "admin_state",
+    "os",
+    "pnode",
+    "snodes",
+    "disk_template",
+    "nic.ips",
+    "nic.macs",
+    "nic.modes",
+    "nic.uuids",
+    "nic.names",
+    "nic.links",
+    "nic.networks",
+    "nic.networks.names",
+    "nic.bridges",
+    "network_port",
+    "disk.sizes",
+    "disk.spindles",
+    "disk.uuids",
+    "disk.names",
+    "disk_usage",
+    "beparams",
+    "hvparams",
+    "oper_state",
+    "oper_ram",
+    "oper_vcpus",
+    "status",
+    "ctime",
+    "mtime",
+    "uuid",
+    "serial_no",
+    "tags",
+]
+
+DISK_TEMPLATE_DISKLESS = "diskless"
+DISK_TEMPLATE_PLAIN = "plain"
+DISK_TEMPLATE_DRBD = "drbd"
+DISK_TEMPLATE_FILE = "file"
+DISK_TEMPLATE_SHARED_FILE = "sharedfile"
+DISK_TEMPLATE_BLOCK = "blockdev"
+DISK_TEMPLATE_RBD = "rbd"
+DISK_TEMPLATE_EXT = "ext"
+DISK_TEMPLATE_GLUSTER = "gluster"
+
+# disks mirrored between the primary and the secondary node
+DISK_TEMPLATES_INT_MIRROR = [DISK_TEMPLATE_DRBD]
+# disks on storage shared by the nodes, the instance can move to any node without copying them
+DISK_TEMPLATES_EXT_MIRROR = [
+    DISK_TEMPLATE_DISKLESS,
+    DISK_TEMPLATE_SHARED_FILE,
+    DISK_TEMPLATE_BLOCK,
+    DISK_TEMPLATE_RBD,
+    DISK_TEMPLATE_EXT,
+    DISK_TEMPLATE_GLUSTER,
+]
+
+
+@with_slots
 @dataclass
 class BackendParams:
     vcpus: int
@@ -13,8 +74,27 @@ class BackendParams:
     spindle_use: Optional[bool] = None
 
 
+@with_slots
 @dataclass
 class InstanceInfo:
+    INTERNED_FIELDS: ClassVar[tuple[str, ...]] = (
+        "admin_state",
+        "os",
+        "pnode",
+        "snodes",
+        "disk_template",
+        "status",
+    )
+    # interned only by dict_to_dataclass(..., compact=True), rebuilding them costs more time
+    COMPACT_FIELDS: ClassVar[tuple[str, ...]] = (
+        "nic_modes",
+        "nic_links",
+        "nic_networks",
+        "nic_networks_names",
+        "nic_bridges",
+        "hvparams",
+    )
+
     name: str
     admin_state: str
     os: str
@@ -52,6 +132,7 @@ class InstanceInfo:
     tags: list[str]
 
 
+@with_slots
 @dataclass
 class NewInstance:
     name: str
@@ -64,3 +145,22 @@ class NewInstance:
     snode: Optional[str] = None
     hvparams: Optional[dict[str, Any]] = None
     beparams: Optional[BackendParams] = None
+
+
+@dataclass
+class MultiAllocResult:
+    """Result of an ``instances-multi-alloc`` job.
+
+    ``allocatable`` instances were placed and get a creation job each, ``jobs`` holds
+    ``[success, job id or error]`` for these jobs in the same order. ``allocation_failed``
+    instances could not be placed.
+    """
+
+    allocatable: list[str]
+    allocation_failed: list[str]
+    jobs: list[list[Any]]
+
+    @property
+    def instance_jobs(self) -> dict[str, int]:
+        """Creation job ids by instance name, for the jobs that could be submitted."""
+        return {self.allocatable[i]: job_id for i, (success, job_id) in enumerate(self.jobs) if success}
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from typing import Any, Dict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Optional
+
+from client.utils import with_slots
 
 JOB_STATUS_QUEUED = "queued"
 JOB_STATUS_WAITING = "waiting"
@@ -22,8 +25,11 @@ JOB_STATUS_FINALIZED = [
 ]
 
 
+@with_slots
 @dataclass
 class Job:
+    INTERNED_FIELDS: ClassVar[tuple[str, ...]] = ("status",)
+
     id: int
     status: str
     ops: list[Dict[str, Any]]
@@ -35,3 +41,78 @@ class Job:
 
     def is_finalized(self) -> bool:
         return self.status in JOB_STATUS_FINALIZED
+
+
+@with_slots
+@dataclass
+class JobLogEntry:
+    """Progress message of a job, as returned by ``jobs/<id>/wait``."""
+
+    serial: int
+    timestamp: float
+    type: str
+    message: Any
+
+    @classmethod
+    def from_list(cls, entry: Sequence[Any]) -> "JobLogEntry":
+        """Create an entry from the RAPI format ``[serial, [seconds, microseconds], type, message]``."""
+        serial, (seconds, microseconds), log_type, message = entry
+        return cls(serial, seconds + microseconds / 1e6, log_type, message)
+
+
+@dataclass
+class BatchJobResult:
+    """Job submitted for one instance of a batch operation.
+
+    ``error`` is set if the job could not be submitted (or, when waiting, did not finish in
+    time or its status could not be queried); ``job`` is only set when the batch waited for
+    the jobs.
+    """
+
+    instance_name: str
+    job_id: Optional[int] = None
+    error: Optional[BaseException] = None
+    job: Optional[Job] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (self.job is None or self.job.status == JOB_STATUS_SUCCESS)
+
+
+@dataclass
+class JobDependency:
+    """Dependency of a job on another job, evaluated by the master.
+
+    The dependent job waits until job ``job_id`` is finalized; if it did not end with one of
+    ``statuses`` the dependent job fails. An empty ``statuses`` accepts any final status. A
+    negative ``job_id`` is relative to the job being submitted (-1 is the previous job) and is
+    only valid in JobService.submit_chain.
+    """
+
+    job_id: int
+    statuses: list[str] = field(default_factory=lambda: [JOB_STATUS_SUCCESS])
+
+    def resolve(self, job_ids: Sequence[int]) -> "JobDependency":
+        """Return the dependency with a relative job id replaced by one of ``job_ids``."""
+        if self.job_id >= 0:
+            return self
+        index = len(job_ids) + self.job_id
+        if index < 0:
+            raise ValueError(f"Relative dependency {self.job_id} refers to a job before the first one")
+        return JobDependency(job_ids[index], list(self.statuses))
+
+    def to_json(self) -> list[Any]:
+        if self.job_id < 0:
+            raise ValueError(f"Relative dependency {self.job_id} can only be used in a chain of jobs")
+        return [self.job_id, list(self.statuses)]
+
+
+@dataclass
+class ChainStep:
+    """Job of a chain: ``submit`` is called with the resolved ``depends`` and returns the job id.
+
+    With ``depends`` None the job depends on the successful completion of the previous job.
+    """
+
+    submit: Callable[..., int]
+    depends: Optional[list[JobDependency]] = None
@@ -1,9 +1,65 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional
 
+from client.utils import with_slots
 
+# RAPI names of the Node fields
+NODE_FIELDS = [
+    "name",
+    "offline",
+    "master_candidate",
+    "drained",
+    "dtotal",
+    "dfree",
+    "sptotal",
+    "spfree",
+    "mtotal",
+    "mnode",
+    "mfree",
+    "pinst_cnt",
+    "sinst_cnt",
+    "ctotal",
+    "cnos",
+    "cnodes",
+    "csockets",
+    "pip",
+    "sip",
+    "role",
+    "pinst_list",
+    "sinst_list",
+    "master_capable",
+    "vm_capable",
+    "ndparams",
+    "group.uuid",
+    "ctime",
+    "mtime",
+    "uuid",
+    "serial_no",
+    "tags",
+    "secondary_ip",
+]
+
+# roles accepted by nodes/<name>/role
+NODE_ROLE_MASTER_CANDIDATE = "master-candidate"
+NODE_ROLE_REGULAR = "regular"
+NODE_ROLE_DRAINED = "drained"
+NODE_ROLE_OFFLINE = "offline"
+
+# which instances nodes/<name>/evacuate moves away
+NODE_EVAC_PRIMARY = "primary-only"
+NODE_EVAC_SECONDARY = "secondary-only"
+NODE_EVAC_ALL = "all"
+
+NODE_MIGRATION_LIVE = "live"
+NODE_MIGRATION_NON_LIVE = "non-live"
+
+
+@with_slots
 @dataclass
 class Node:
+    INTERNED_FIELDS: ClassVar[tuple[str, ...]] = ("role", "group_uuid")
+    COMPACT_FIELDS: ClassVar[tuple[str, ...]] = ("ndparams",)
+
     name: str
     offline: bool
     master_candidate: bool
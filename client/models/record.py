@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+
+class Record(Dict[str, Any]):
+    """Partial object holding only the fields requested from the RAPI.
+
+    Values are accessible by key or as attributes, e.g. ``record["pnode"]`` or ``record.pnode``.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no field '{name}'") from None
@@ -0,0 +1,115 @@
+"""Builder for Ganeti query filters.
+
+Filters are combined with ``&``, ``|`` and ``~``::
+
+    qfilter = eq("pnode", "node1.example.com") & ~eq("status", "running")
+    qfilter.to_json()  # ["&", ["=", "pnode", "node1.example.com"], ["!", ["=", "status", "running"]]]
+"""
+
+from typing import Any
+
+
+class QueryFilter:
+    """A filter expression in the Ganeti query language."""
+
+    __slots__ = ("expression",)
+
+    def __init__(self, expression: list[Any]):
+        self.expression = expression
+
+    def to_json(self) -> list[Any]:
+        return self.expression
+
+    def __and__(self, other: "QueryFilter") -> "QueryFilter":
+        return and_(self, other)
+
+    def __or__(self, other: "QueryFilter") -> "QueryFilter":
+        return or_(self, other)
+
+    def __invert__(self) -> "QueryFilter":
+        return not_(self)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, QueryFilter) and self.expression == other.expression
+
+    def __hash__(self) -> int:
+        return hash(_freeze(self.expression))
+
+    def __repr__(self) -> str:
+        return f"QueryFilter({self.expression!r})"
+
+
+def eq(field: str, value: Any) -> QueryFilter:
+    return QueryFilter(["=", field, value])
+
+
+def ne(field: str, value: Any) -> QueryFilter:
+    return QueryFilter(["!=", field, value])
+
+
+def lt(field: str, value: Any) -> QueryFilter:
+    return QueryFilter(["<", field, value])
+
+
+def le(field: str, value: Any) -> QueryFilter:
+    return QueryFilter(["<=", field, value])
+
+
+def gt(field: str, value: Any) -> QueryFilter:
+    return QueryFilter([">", field, value])
+
+
+def ge(field: str, value: Any) -> QueryFilter:
+    return QueryFilter([">=", field, value])
+
+
+def regex(field: str, pattern: str) -> QueryFilter:
+    """Match a field against a regular expression."""
+    return QueryFilter(["=~", field, pattern])
+
+
+def contains(field: str, value: Any) -> QueryFilter:
+    """Match list fields containing ``value``, e.g. ``contains("tags", "env:prod")``."""
+    return QueryFilter(["=[]", field, value])
+
+
+def is_true(field: str) -> QueryFilter:
+    """Match boolean fields that are true."""
+    return QueryFilter(["?", field])
+
+
+def any_of(field: str, values: Any) -> QueryFilter:
+    """Match a field equal to one of ``values``, which must not be empty."""
+    filters = [eq(field, value) for value in values]
+    if not filters:
+        raise ValueError(f"any_of({field!r}) needs at least one value")
+    return or_(*filters)
+
+
+def and_(*filters: QueryFilter) -> QueryFilter:
+    return QueryFilter(["&", *_flatten("&", filters)])
+
+
+def or_(*filters: QueryFilter) -> QueryFilter:
+    return QueryFilter(["|", *_flatten("|", filters)])
+
+
+def not_(qfilter: QueryFilter) -> QueryFilter:
+    return QueryFilter(["!", qfilter.expression])
+
+
+def _flatten(operator: str, filters: tuple[QueryFilter, ...]) -> list[Any]:
+    expressions: list[Any] = []
+    for qfilter in filters:
+        if qfilter.expression[0] == operator:
+            expressions.extend(qfilter.expression[1:])
+        else:
+            expressions.append(qfilter.expression)
+    return expressions
+
+
+def _freeze(value: Any) -> Any:
+    """Convert the lists of an expression to tuples, so it can be hashed."""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+# endpoints that only read although they are sent with PUT, e.g. query/instance
+READ_ENDPOINT_PREFIXES = ("query/",)
+
+
+def is_read_request(method: str, endpoint: str = "") -> bool:
+    return method.upper() in READ_METHODS or endpoint.lstrip("/").startswith(READ_ENDPOINT_PREFIXES)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second and bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """Limit the request rate and the number of concurrent requests sent to the master.
+
+    Reads (GET and the PUT requests of ``query/*``) and writes (all other requests, which submit
+    jobs) have separate budgets; ``None`` means unlimited.
+    One limiter is shared by all threads using the same client. Note that long polling a job
+    (``wait_for_job(long_poll=True)``) keeps a read slot for up to the server-side wait time.
+    """
+
+    def __init__(
+        self,
+        read_rate: Optional[float] = None,
+        write_rate: Optional[float] = None,
+        read_burst: Optional[float] = None,
+        write_burst: Optional[float] = None,
+        max_concurrent_reads: Optional[int] = None,
+        max_concurrent_writes: Optional[int] = None,
+    ):
+        self._read_bucket = TokenBucket(read_rate, read_burst) if read_rate else None
+        self._write_bucket = TokenBucket(write_rate, write_burst) if write_rate else None
+        self._read_slots = threading.BoundedSemaphore(max_concurrent_reads) if max_concurrent_reads else None
+        self._write_slots = threading.BoundedSemaphore(max_concurrent_writes) if max_concurrent_writes else None
+
+    @contextmanager
+    def limit(self, method: str, endpoint: str = "") -> Iterator[None]:
+        """Wait for the budget of the request and hold a concurrency slot while the block runs."""
+        is_read = is_read_request(method, endpoint)
+        bucket = self._read_bucket if is_read else self._write_bucket
+        slots = self._read_slots if is_read else self._write_slots
+        if slots is not None:
+            slots.acquire()
+        try:
+            if bucket is not None:
+                bucket.acquire()
+            yield
+        finally:
+            if slots is not None:
+                slots.release()
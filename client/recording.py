@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import io
+import json
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+_FORMAT_VERSION = 1
+# headers kept with a recorded response
+_RECORDED_HEADERS = ("Content-Type", "Retry-After")
+
+
+class ResponseNotRecordedError(requests.exceptions.RequestException):
+    """Raised by ReplayAdapter for a request that is not part of the recording."""
+
+
+class ResponseRecording:
+    """RAPI responses keyed by method, endpoint, query parameters and body.
+
+    The key doesn't contain the address of the master, so a recording can be replayed with any
+    address. Recordings are saved as gzip compressed JSON.
+    """
+
+    def __init__(self, responses: Optional[Mapping[str, dict[str, Any]]] = None):
+        self.responses: dict[str, dict[str, Any]] = dict(responses or {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        url = urlsplit(request.url or "")
+        params = sorted(parse_qsl(url.query, keep_blank_values=True))
+        key = f"{request.method} {url.path}"
+        if params:
+            key += "?" + "&".join(f"{name}={value}" for name, value in params)
+        if request.body:
+            key += " " + hashlib.sha256(_canonical_body(request.body)).hexdigest()[:16]
+        return key
+
+    def add(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        entry = {
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in _RECORDED_HEADERS if name in response.headers},
+            "body": response.content.decode("utf-8"),
+        }
+        with self._lock:
+            self.responses[self.key(request)] = entry
+
+    def get(self, request: requests.PreparedRequest) -> Optional[dict[str, Any]]:
+        return self.responses.get(self.key(request))
+
+    def save(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            data = {"version": _FORMAT_VERSION, "responses": dict(self.responses)}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ResponseRecording":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version {data.get('version')}")
+        return cls(data["responses"])
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+
+def _canonical_body(body: Union[str, bytes]) -> bytes:
+    """The body with sorted keys if it is JSON, so the key doesn't depend on the order of arguments."""
+    raw = body.encode() if isinstance(body, str) else body
+    try:
+        return json.dumps(json.loads(raw), sort_keys=True).encode()
+    except ValueError:
+        return raw
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Send requests to the RAPI and add every response to ``recording``.
+
+    Use it as ``transport`` of BaseApiClient; keyword arguments configure the connection pool
+    like those of HTTPAdapter.
+    """
+
+    def __init__(self, recording: ResponseRecording, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.recording = recording
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        response = super().send(request, *args, **kwargs)
+        self.recording.add(request, response)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answer requests from ``recording`` without any network access.
+
+    Requests that were not recorded raise ResponseNotRecordedError.
+    """
+
+    def __init__(self, recording: ResponseRecording):
+        super().__init__()
+        self.recording = recording
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        entry = self.recording.get(request)
+        if entry is None:
+            raise ResponseNotRecordedError(
+                f"No recorded response for {ResponseRecording.key(request)}", request=request
+            )
+        body = entry["body"].encode("utf-8")
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers={**entry["headers"], "Content-Length": str(len(body))},
+            status=entry["status"],
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
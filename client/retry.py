@@ -0,0 +1,63 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+# Ganeti RAPI submits a job for most PUT, POST and DELETE requests, so only GET is safe to repeat by default
+DEFAULT_RETRY_METHODS = frozenset({"GET"})
+DEFAULT_RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how often to repeat a failed request.
+
+    Connection errors, timeouts and responses with one of ``retry_status_codes`` are retried for
+    ``retry_methods``, up to ``max_attempts`` attempts in total. The delay before attempt n+1 is
+    chosen at random between 0 and ``backoff_factor * 2 ** (n - 1)`` (full jitter), capped at
+    ``max_backoff``. A ``Retry-After`` header of the response takes precedence, capped the same way.
+    """
+
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    retry_status_codes: frozenset[int] = DEFAULT_RETRY_STATUS_CODES
+    retry_methods: frozenset[str] = DEFAULT_RETRY_METHODS
+    respect_retry_after: bool = True
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return attempt < self.max_attempts and method.upper() in self.retry_methods
+
+    def is_retryable_exception(self, exc: requests.exceptions.RequestException) -> bool:
+        return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def is_retryable_response(self, response: requests.Response) -> bool:
+        return response.status_code in self.retry_status_codes
+
+    def get_backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Return the delay in seconds before the attempt following ``attempt``."""
+        if response is not None and self.respect_retry_after:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.backoff_factor * 2 ** (attempt - 1), self.max_backoff))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
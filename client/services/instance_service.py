@@ -1,21 +1,58 @@
 import typing
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Optional
 
 from client.api_client import BaseApiClient
-from client.models.instance import InstanceInfo, NewInstance
-from client.utils import dataclass_to_dict, dict_to_dataclass
+from client.exceptions import GanetiRAPIClientError, GanetiRAPIError, JobFailedError
+from client.models.instance import InstanceInfo, MultiAllocResult, NewInstance
+from client.models.job import JOB_STATUS_SUCCESS, BatchJobResult, JobDependency
+from client.models.record import Record
+from client.services.job_service import JobService
+from client.utils import dataclass_to_dict, dict_to_dataclass, normalize_keys
+
+
+# startup, reboot and delete don't pass the request body on to the opcode, so they can't depend on jobs
+def _depends_params(depends: Optional[Sequence[JobDependency]]) -> dict[str, Any]:
+    if not depends:
+        return {}
+    return {"depends": [dependency.to_json() for dependency in depends]}
 
 
 class InstanceService:
     ENDPOINT = "instances"
+    MULTI_ALLOC_ENDPOINT = "instances-multi-alloc"
 
     def __init__(self, api_client: BaseApiClient):
         self.api_client = api_client
+        self.job_service = JobService(api_client)
 
     def get_instance_names(self) -> list[str]:
         instances = self.api_client.get(self.ENDPOINT)
         return [instance["id"] for instance in instances]
 
+    def get_instances(self, compact: bool = False) -> list[InstanceInfo]:
+        """Get detailed info for all instances in a single bulk request.
+
+        ``compact`` trades conversion time for memory, see dict_to_dataclass.
+        """
+        instances_raw = self.api_client.get(self.ENDPOINT, bulk=1)
+        return [dict_to_dataclass(InstanceInfo, instance_raw, compact) for instance_raw in instances_raw]
+
+    def iter_instances(self, compact: bool = False) -> Iterator[InstanceInfo]:
+        """Like get_instances, but yield each instance as soon as it is received and parsed."""
+        for instance_raw in self.api_client.iter_get(self.ENDPOINT, bulk=1):
+            yield dict_to_dataclass(InstanceInfo, instance_raw, compact)
+
+    def get_partial_instances(self, fields: Sequence[str]) -> list[Record]:
+        """Get only the given fields (e.g. ``["name", "pnode", "status"]``) for all instances.
+
+        Field names use the RAPI notation (``nic.ips``); keys of the returned records use the
+        model notation (``nic_ips``).
+        """
+        instances_raw = self.api_client.get(self.ENDPOINT, bulk=1, fields=",".join(fields))
+        return [Record(normalize_keys(instance_raw)) for instance_raw in instances_raw]
+
     def create_instance(
         self,
         new_instance: NewInstance,
@@ -23,14 +60,11 @@ class InstanceService:
         name_check: bool = False,
         start: bool = True,
         ignore_ipolicy: bool = False,
+        depends: Optional[Sequence[JobDependency]] = None,
     ) -> int:
-        params_raw = dataclass_to_dict(new_instance)
-        # Ensure params is a dict for mypy
-        if not isinstance(params_raw, dict):
-            raise TypeError("Expected dataclass_to_dict to return a dict")
-        params = params_raw
+        params = self._create_params(new_instance)
+        params.update(_depends_params(depends))
         params["__version__"] = 1
-        params["mode"] = "create"
         return typing.cast(
             int,
             self.api_client.post(
@@ -43,8 +77,63 @@ class InstanceService:
             ),
         )
 
-    def modify_instance(self, instance_name: str, **kwargs: Any) -> int:
-        return typing.cast(int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/modify", **kwargs))
+    def create_instances(
+        self,
+        new_instances: Sequence[NewInstance],
+        iallocator: Optional[str] = None,
+        opportunistic_locking: bool = False,
+        ip_check: bool = False,
+        name_check: bool = False,
+        start: bool = True,
+        ignore_ipolicy: bool = False,
+    ) -> int:
+        """Create many instances with one job, placed together by a single iallocator run.
+
+        The job only allocates the instances and submits a creation job for each of them; use
+        get_multi_alloc_result to get the placement and these jobs.
+        """
+        instances = [
+            dict(
+                self._create_params(new_instance),
+                ip_check=ip_check,
+                name_check=name_check,
+                start=start,
+                ignore_ipolicy=ignore_ipolicy,
+            )
+            for new_instance in new_instances
+        ]
+        body: dict[str, Any] = {"instances": instances, "opportunistic_locking": opportunistic_locking}
+        if iallocator is not None:
+            body["iallocator"] = iallocator
+        return typing.cast(int, self.api_client.post(self.MULTI_ALLOC_ENDPOINT, **body))
+
+    def get_multi_alloc_result(self, job_id: int, timeout: int = 300, poll_interval: int = 5) -> MultiAllocResult:
+        """Wait for a job of create_instances and return its allocation result.
+
+        Raises JobFailedError if the allocation job did not succeed.
+        """
+        job = self.job_service.wait_for_job(job_id, timeout=timeout, poll_interval=poll_interval, long_poll=True)
+        if job.status != JOB_STATUS_SUCCESS:
+            raise JobFailedError(job.id, job.status, job.opresult)
+        return dict_to_dataclass(MultiAllocResult, job.opresult[0])
+
+    @staticmethod
+    def _create_params(new_instance: NewInstance) -> dict[str, Any]:
+        params_raw = dataclass_to_dict(new_instance)
+        # Ensure params is a dict for mypy
+        if not isinstance(params_raw, dict):
+            raise TypeError("Expected dataclass_to_dict to return a dict")
+        params = params_raw
+        params["mode"] = "create"
+        return params
+
+    def modify_instance(
+        self, instance_name: str, depends: Optional[Sequence[JobDependency]] = None, **kwargs: Any
+    ) -> int:
+        return typing.cast(
+            int,
+            self.api_client.put(f"{self.ENDPOINT}/{instance_name}/modify", **_depends_params(depends), **kwargs),
+        )
 
     def delete_instance(self, instance_name: str) -> int:
         return typing.cast(int, self.api_client.delete(f"{self.ENDPOINT}/{instance_name}"))
@@ -52,27 +141,102 @@ class InstanceService:
     def start_instance(self, instance_name: str) -> int:
         return typing.cast(int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/startup"))
 
-    def stop_instance(self, instance_name: str) -> int:
-        return typing.cast(int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/shutdown"))
+    def stop_instance(self, instance_name: str, depends: Optional[Sequence[JobDependency]] = None) -> int:
+        return typing.cast(
+            int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/shutdown", **_depends_params(depends))
+        )
 
     def restart_instance(self, instance_name: str) -> int:
         return typing.cast(int, self.api_client.post(f"{self.ENDPOINT}/{instance_name}/reboot"))
 
-    def migrate_instance(self, instance_name: str) -> int:
-        return typing.cast(int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/migrate"))
+    def migrate_instance(self, instance_name: str, depends: Optional[Sequence[JobDependency]] = None) -> int:
+        return typing.cast(
+            int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/migrate", **_depends_params(depends))
+        )
 
-    def failover_instance(self, instance_name: str) -> int:
-        return typing.cast(int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/failover"))
+    def failover_instance(self, instance_name: str, depends: Optional[Sequence[JobDependency]] = None) -> int:
+        return typing.cast(
+            int, self.api_client.put(f"{self.ENDPOINT}/{instance_name}/failover", **_depends_params(depends))
+        )
 
-    def grow_instance_disk(self, instance_name: str, disk_index: int, amount: int) -> int:
+    def grow_instance_disk(
+        self, instance_name: str, disk_index: int, amount: int, depends: Optional[Sequence[JobDependency]] = None
+    ) -> int:
         return typing.cast(
-            int, self.api_client.post(f"{self.ENDPOINT}/{instance_name}/disk/{disk_index}/grow", amount=amount)
+            int,
+            self.api_client.post(
+                f"{self.ENDPOINT}/{instance_name}/disk/{disk_index}/grow", amount=amount, **_depends_params(depends)
+            ),
         )
 
+    def start_instances(self, instance_names: Iterable[str], **kwargs: Any) -> dict[str, BatchJobResult]:
+        """Start many instances, see run_batch for the keyword arguments."""
+        return self.run_batch(self.start_instance, instance_names, **kwargs)
+
+    def stop_instances(self, instance_names: Iterable[str], **kwargs: Any) -> dict[str, BatchJobResult]:
+        """Stop many instances, see run_batch for the keyword arguments."""
+        return self.run_batch(self.stop_instance, instance_names, **kwargs)
+
+    def restart_instances(self, instance_names: Iterable[str], **kwargs: Any) -> dict[str, BatchJobResult]:
+        """Restart many instances, see run_batch for the keyword arguments."""
+        return self.run_batch(self.restart_instance, instance_names, **kwargs)
+
+    def migrate_instances(self, instance_names: Iterable[str], **kwargs: Any) -> dict[str, BatchJobResult]:
+        """Migrate many instances, see run_batch for the keyword arguments."""
+        return self.run_batch(self.migrate_instance, instance_names, **kwargs)
+
+    def failover_instances(self, instance_names: Iterable[str], **kwargs: Any) -> dict[str, BatchJobResult]:
+        """Failover many instances, see run_batch for the keyword arguments."""
+        return self.run_batch(self.failover_instance, instance_names, **kwargs)
+
+    def run_batch(
+        self,
+        operation: Callable[[str], int],
+        instance_names: Iterable[str],
+        max_workers: int = 8,
+        wait: bool = False,
+        timeout: int = 300,
+        poll_interval: int = 5,
+    ) -> dict[str, BatchJobResult]:
+        """Submit ``operation`` for every instance and return the results by instance name.
+
+        Jobs are submitted by up to ``max_workers`` threads; an error submitting one job is stored
+        in its result and doesn't affect the others. With ``wait`` all jobs are awaited together
+        (see JobService.wait_for_jobs); jobs still running after ``timeout`` seconds get a
+        TimeoutError. If querying the jobs fails, the unfinished jobs get that error instead.
+        """
+        results = {instance_name: BatchJobResult(instance_name) for instance_name in instance_names}
+        if not results:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(operation, instance_name): instance_name for instance_name in results}
+            for future in as_completed(futures):
+                result = results[futures[future]]
+                try:
+                    result.job_id = future.result()
+                except Exception as e:
+                    result.error = e
+
+        if wait:
+            self._wait_for_batch(list(results.values()), timeout, poll_interval)
+        return results
+
+    def _wait_for_batch(self, results: list[BatchJobResult], timeout: int, poll_interval: int) -> None:
+        submitted = {result.job_id: result for result in results if result.job_id is not None}
+        if not submitted:
+            return
+        try:
+            for job in self.job_service.wait_for_jobs(submitted, timeout=timeout, poll_interval=poll_interval):
+                submitted[job.id].job = job
+        except (TimeoutError, GanetiRAPIError, GanetiRAPIClientError) as e:
+            # the job ids stay in the results, the jobs can still be awaited or cancelled
+            for result in submitted.values():
+                if result.job is None:
+                    result.error = e
+
     def get_instance(self, instance_name: str) -> InstanceInfo:
         instance_info_raw = self.api_client.get(f"{self.ENDPOINT}/{instance_name}")
-        # replace . with _ in keynames e.g. nic.ips -> nic_ips
-        instance_info_raw = {key.replace(".", "_"): value for key, value in instance_info_raw.items()}
         return dict_to_dataclass(InstanceInfo, instance_info_raw)
 
     def get_instance_info(self, instance_name: str, static: bool = False) -> int:
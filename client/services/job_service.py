@@ -1,15 +1,30 @@
 import time
+from collections.abc import Callable, Collection, Iterable, Iterator
+from typing import Any, Optional, Union
 
 from client.api_client import BaseApiClient
-from client.models.job import Job
+from client.exceptions import GanetiRAPIError
+from client.models.job import JOB_STATUS_FINALIZED, ChainStep, Job, JobDependency, JobLogEntry
+from client.query_filter import any_of
+from client.services.query_service import QueryService
 from client.utils import dict_to_dataclass
 
+# status codes returned by RAPI versions without a usable jobs/<id>/wait endpoint
+_WAIT_UNSUPPORTED_STATUS = (404, 405, 501)
+# first interval when falling back from long polling to polling
+_MIN_POLL_INTERVAL = 0.5
+# the master answers jobs/<id>/wait after at most 10 seconds without a change
+_WAIT_REQUEST_TIMEOUT = 15.0
+_JOB_STATUS_FIELDS = ["id", "status"]
+_JOB_FIELDS = ["id", "status", "ops", "opstatus", "opresult"]
+
 
 class JobService:
     ENDPOINT = "jobs"
 
     def __init__(self, api_client: BaseApiClient):
         self.api_client = api_client
+        self.query_service = QueryService(api_client)
 
     def get_jobs(self) -> list[int]:
         jobs_raw = self.api_client.get(self.ENDPOINT)
@@ -22,7 +37,37 @@ class JobService:
     def cancel_job(self, job_id: int) -> None:
         self.api_client.delete(f"{self.ENDPOINT}/{job_id}")
 
-    def wait_for_job(self, job_id: int, timeout: int = 300, poll_interval: int = 5) -> Job:
+    def wait_for_job_change(
+        self,
+        job_id: int,
+        fields: list[str],
+        previous_job_info: Optional[list[Any]] = None,
+        previous_log_serial: Optional[int] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Block on the master until the job's fields or log change.
+
+        Returns a dict with ``job_info`` (values of ``fields``) and ``log_entries``,
+        or None if nothing changed within the server-side timeout.
+        """
+        change = self.api_client.get_with_body(
+            f"{self.ENDPOINT}/{job_id}/wait",
+            min_timeout=_WAIT_REQUEST_TIMEOUT,
+            fields=fields,
+            previous_job_info=previous_job_info,
+            previous_log_serial=previous_log_serial,
+        )
+        return change or None
+
+    def wait_for_job(self, job_id: int, timeout: int = 300, poll_interval: int = 5, long_poll: bool = False) -> Job:
+        """Wait until the job is finalized.
+
+        With ``long_poll`` the master holds each request until the job status changes, so the
+        job is returned as soon as it finishes. If the wait endpoint is not available, the job
+        is polled with an interval growing up to ``poll_interval``.
+        """
+        if long_poll:
+            return self._wait_for_job_long_poll(job_id, timeout, poll_interval)
+
         job_info = self.get_job_info(job_id)
         start_time = time.time()
         while not job_info.is_finalized():
@@ -32,3 +77,136 @@ class JobService:
             job_info = self.get_job_info(job_id)
 
         return job_info
+
+    def stream_job_log(self, job_id: int, timeout: int = 300, poll_interval: int = 5) -> Iterator[JobLogEntry]:
+        """Yield the log entries of a job as they are written, until the job is finalized.
+
+        Each wait request only returns the entries after the last one received. If the wait
+        endpoint is not available, the job is polled every ``poll_interval`` seconds instead.
+        """
+        start_time = time.time()
+        previous_job_info: Optional[list[Any]] = None
+        previous_log_serial: Optional[int] = None
+        while True:
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Job {job_id} timed out after {timeout} seconds")
+            try:
+                change = self.wait_for_job_change(job_id, ["status"], previous_job_info, previous_log_serial)
+            except GanetiRAPIError as e:
+                if e.status_code not in _WAIT_UNSUPPORTED_STATUS:
+                    raise
+                yield from self._poll_job_log(job_id, previous_log_serial, start_time, timeout, poll_interval)
+                return
+            if change is None:
+                continue
+            for entry in change["log_entries"]:
+                log_entry = JobLogEntry.from_list(entry)
+                previous_log_serial = log_entry.serial
+                yield log_entry
+            previous_job_info = change["job_info"]
+            if previous_job_info[0] in JOB_STATUS_FINALIZED:
+                return
+
+    def wait_for_jobs(self, job_ids: Iterable[int], timeout: int = 300, poll_interval: int = 5) -> Iterator[Job]:
+        """Wait for many jobs at once and yield each job as soon as it is finalized.
+
+        Every poll checks the status of all pending jobs with one query request, and fetches the
+        details of newly finalized jobs with a second one, independent of the number of jobs.
+        Raises TimeoutError if jobs are still pending after ``timeout`` seconds.
+        """
+        pending = set(job_ids)
+        start_time = time.time()
+        while pending:
+            statuses = self._query_jobs(pending, _JOB_STATUS_FIELDS)
+            finalized = [
+                job_id for job_id in sorted(pending) if statuses.get(job_id, {}).get("status") in JOB_STATUS_FINALIZED
+            ]
+            if finalized:
+                jobs_raw = self._query_jobs(finalized, _JOB_FIELDS)
+                for job_id in finalized:
+                    pending.discard(job_id)
+                    yield dict_to_dataclass(Job, jobs_raw[job_id]) if job_id in jobs_raw else self.get_job_info(job_id)
+
+            # jobs unknown to the query are looked up one by one, which raises if they don't exist
+            for job_id in [job_id for job_id in sorted(pending) if job_id not in statuses]:
+                job_info = self.get_job_info(job_id)
+                if job_info.is_finalized():
+                    pending.discard(job_id)
+                    yield job_info
+
+            if not pending:
+                break
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Jobs {sorted(pending)} timed out after {timeout} seconds")
+            time.sleep(poll_interval)
+
+    def submit_chain(self, steps: Iterable[Union[ChainStep, Callable[..., int]]]) -> list[int]:
+        """Submit jobs that depend on each other, so the master runs them without client round trips.
+
+        A step is a ChainStep or a callable accepting ``depends``, e.g.
+        ``functools.partial(instance_service.migrate_instance, "vm1")``; by default every job
+        depends on the success of the previous one. Returns the job ids in order. If a submission
+        fails, the jobs submitted before are not canceled.
+        """
+        job_ids: list[int] = []
+        for step in steps:
+            if not isinstance(step, ChainStep):
+                step = ChainStep(step)
+            depends = step.depends
+            if depends is None:
+                depends = [JobDependency(-1)] if job_ids else []
+            resolved = [dependency.resolve(job_ids) for dependency in depends]
+            job_ids.append(step.submit(depends=resolved or None))
+        return job_ids
+
+    def _query_jobs(self, job_ids: Collection[int], fields: list[str]) -> dict[int, dict[str, Any]]:
+        rows = self.query_service.query("job", fields, any_of("id", job_ids))
+        return {row["id"]: row for row in rows if row["id"] is not None and row["status"] is not None}
+
+    def _wait_for_job_long_poll(self, job_id: int, timeout: int, poll_interval: int) -> Job:
+        start_time = time.time()
+        previous_job_info: Optional[list[Any]] = None
+        while True:
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Job {job_id} timed out after {timeout} seconds")
+            try:
+                change = self.wait_for_job_change(job_id, ["status"], previous_job_info=previous_job_info)
+            except GanetiRAPIError as e:
+                if e.status_code not in _WAIT_UNSUPPORTED_STATUS:
+                    raise
+                return self._wait_for_job_adaptive(job_id, start_time, timeout, poll_interval)
+            if change is None:
+                continue
+            previous_job_info = change["job_info"]
+            if previous_job_info[0] in JOB_STATUS_FINALIZED:
+                return self.get_job_info(job_id)
+
+    def _wait_for_job_adaptive(self, job_id: int, start_time: float, timeout: int, max_interval: float) -> Job:
+        interval = min(_MIN_POLL_INTERVAL, max_interval)
+        job_info = self.get_job_info(job_id)
+        while not job_info.is_finalized():
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Job {job_id} timed out after {timeout} seconds")
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+            job_info = self.get_job_info(job_id)
+
+        return job_info
+
+    def _poll_job_log(
+        self, job_id: int, previous_log_serial: Optional[int], start_time: float, timeout: int, poll_interval: int
+    ) -> Iterator[JobLogEntry]:
+        while True:
+            job_raw = self.api_client.get(f"{self.ENDPOINT}/{job_id}")
+            # oplog holds the entries of every opcode, all numbered by one serial
+            for op_log in job_raw.get("oplog") or []:
+                for entry in op_log:
+                    log_entry = JobLogEntry.from_list(entry)
+                    if previous_log_serial is None or log_entry.serial > previous_log_serial:
+                        previous_log_serial = log_entry.serial
+                        yield log_entry
+            if job_raw["status"] in JOB_STATUS_FINALIZED:
+                return
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Job {job_id} timed out after {timeout} seconds")
+            time.sleep(poll_interval)
@@ -1,6 +1,11 @@
+import typing
+from collections.abc import Iterator, Sequence
+from typing import Any, Optional
+
 from client.api_client import BaseApiClient
-from client.models.node import Node
-from client.utils import dict_to_dataclass
+from client.models.node import NODE_EVAC_ALL, Node
+from client.models.record import Record
+from client.utils import dict_to_dataclass, normalize_keys
 
 
 class NodeService:
@@ -13,7 +18,65 @@ class NodeService:
         nodes = self.api_client.get(self.ENDPOINT)
         return [node["id"] for node in nodes]
 
+    def get_nodes(self) -> list[Node]:
+        """Get detailed info for all nodes in a single bulk request."""
+        nodes_raw = self.api_client.get(self.ENDPOINT, bulk=1)
+        return [dict_to_dataclass(Node, node_raw) for node_raw in nodes_raw]
+
+    def iter_nodes(self) -> Iterator[Node]:
+        """Like get_nodes, but yield each node as soon as it is received and parsed."""
+        for node_raw in self.api_client.iter_get(self.ENDPOINT, bulk=1):
+            yield dict_to_dataclass(Node, node_raw)
+
+    def get_partial_nodes(self, fields: Sequence[str]) -> list[Record]:
+        """Get only the given fields (e.g. ``["name", "mfree", "dfree"]``) for all nodes."""
+        nodes_raw = self.api_client.get(self.ENDPOINT, bulk=1, fields=",".join(fields))
+        return [Record(normalize_keys(node_raw)) for node_raw in nodes_raw]
+
     def get_node(self, node_name: str) -> Node:
         node_info_raw = self.api_client.get(f"{self.ENDPOINT}/{node_name}")
-        node_info_raw = {key.replace(".", "_"): value for key, value in node_info_raw.items()}
         return dict_to_dataclass(Node, node_info_raw)
+
+    def get_node_role(self, node_name: str) -> str:
+        return typing.cast(str, self.api_client.get(f"{self.ENDPOINT}/{node_name}/role"))
+
+    def set_node_role(self, node_name: str, role: str, force: bool = False) -> int:
+        """Change the role of a node, e.g. to NODE_ROLE_DRAINED before maintenance."""
+        return typing.cast(int, self.api_client.put_value(f"{self.ENDPOINT}/{node_name}/role", role, force=int(force)))
+
+    def evacuate_node(
+        self,
+        node_name: str,
+        mode: str = NODE_EVAC_ALL,
+        iallocator: Optional[str] = None,
+        remote_node: Optional[str] = None,
+        early_release: bool = False,
+    ) -> int:
+        """Move the instances off a node; ``mode`` selects primary, secondary or all instances.
+
+        The new nodes are chosen by ``iallocator`` (or the cluster default), or ``remote_node``
+        takes all secondaries. The returned job submits one job per instance.
+        """
+        params: dict[str, Any] = {"mode": mode, "early_release": early_release}
+        if iallocator is not None:
+            params["iallocator"] = iallocator
+        if remote_node is not None:
+            params["remote_node"] = remote_node
+        return typing.cast(int, self.api_client.post(f"{self.ENDPOINT}/{node_name}/evacuate", **params))
+
+    def migrate_node(
+        self,
+        node_name: str,
+        mode: Optional[str] = None,
+        target_node: Optional[str] = None,
+        iallocator: Optional[str] = None,
+    ) -> int:
+        """Migrate all primary instances of a node, live or non-live (``mode``)."""
+        params: dict[str, Any] = {}
+        if mode is not None:
+            params["mode"] = mode
+        if target_node is not None:
+            params["target_node"] = target_node
+        if iallocator is not None:
+            params["iallocator"] = iallocator
+        return typing.cast(int, self.api_client.post(f"{self.ENDPOINT}/{node_name}/migrate", **params))
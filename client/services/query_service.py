@@ -0,0 +1,63 @@
+import dataclasses
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from client.api_client import BaseApiClient
+from client.models.instance import INSTANCE_FIELDS, InstanceInfo
+from client.models.node import NODE_FIELDS, Node
+from client.models.record import Record
+from client.query_filter import QueryFilter
+from client.retry import RetryPolicy
+from client.utils import dict_to_dataclass, normalize_keys
+
+# result status of a field with a valid value, other states (unknown field, no data, ...) become None
+RS_NORMAL = 0
+
+
+class QueryService:
+    """Query resources with filters evaluated on the master.
+
+    Resources are e.g. ``instance``, ``node``, ``group``, ``job``; see ``get_fields`` for their
+    fields. Filters are built with ``client.query_filter``.
+    """
+
+    ENDPOINT = "query"
+
+    def __init__(self, api_client: BaseApiClient):
+        self.api_client = api_client
+
+    def query(self, resource: str, fields: Sequence[str], qfilter: Optional[QueryFilter] = None) -> list[Record]:
+        """Return the given fields of all objects matching ``qfilter``."""
+        body: dict[str, Any] = {"fields": list(fields)}
+        if qfilter is not None:
+            body["qfilter"] = qfilter.to_json()
+        result = self.api_client.put(f"{self.ENDPOINT}/{resource}", retry_policy=self._retry_policy(), **body)
+        # values are returned in the order of the requested fields
+        return [
+            Record(
+                normalize_keys(
+                    {fields[i]: value if status == RS_NORMAL else None for i, (status, value) in enumerate(row)}
+                )
+            )
+            for row in result["data"]
+        ]
+
+    def _retry_policy(self) -> Optional[RetryPolicy]:
+        """The client's policy extended to PUT: queries are sent with PUT but only read."""
+        policy = self.api_client.retry_policy
+        if policy is None:
+            return None
+        return dataclasses.replace(policy, retry_methods=policy.retry_methods | {"PUT"})
+
+    def get_fields(self, resource: str) -> list[dict[str, Any]]:
+        """Return the definitions (name, title, kind, doc) of all fields of a resource."""
+        result: list[dict[str, Any]] = self.api_client.get(f"{self.ENDPOINT}/{resource}/fields")
+        return result
+
+    def query_instances(self, qfilter: Optional[QueryFilter] = None) -> list[InstanceInfo]:
+        """Return all instances matching ``qfilter``, e.g. ``eq("pnode", "node1") & eq("status", "running")``."""
+        return [dict_to_dataclass(InstanceInfo, row) for row in self.query("instance", INSTANCE_FIELDS, qfilter)]
+
+    def query_nodes(self, qfilter: Optional[QueryFilter] = None) -> list[Node]:
+        """Return all nodes matching ``qfilter``, e.g. ``eq("group.uuid", uuid) & ~eq("offline", True)``."""
+        return [dict_to_dataclass(Node, row) for row in self.query("node", NODE_FIELDS, qfilter)]
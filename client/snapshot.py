@@ -0,0 +1,136 @@
+import dataclasses
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, Protocol, TypeVar
+
+from client.api_client import BaseApiClient
+from client.exceptions import ResourceNotFoundError
+from client.models.instance import InstanceInfo
+from client.models.node import Node
+from client.models.record import Record
+from client.query_filter import any_of
+from client.services.instance_service import InstanceService
+from client.services.node_service import NodeService
+from client.services.query_service import QueryService
+
+# fields fetched for every object on refresh to detect changes of the configuration
+VERSION_FIELDS = ["name", "serial_no", "mtime"]
+# fields fetched for every object on refresh because they change without a new serial_no
+INSTANCE_RUNTIME_FIELDS = ["status", "oper_state", "oper_ram", "oper_vcpus"]
+NODE_RUNTIME_FIELDS = ["mfree", "dfree"]
+
+
+class _Versioned(Protocol):
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def serial_no(self) -> int: ...
+
+    @property
+    def mtime(self) -> float: ...
+
+
+T = TypeVar("T", bound=_Versioned)
+
+
+@dataclass
+class ChangeSet(Generic[T]):
+    added: list[T] = field(default_factory=list)
+    changed: list[T] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+@dataclass
+class SnapshotChanges:
+    instances: ChangeSet[InstanceInfo]
+    nodes: ChangeSet[Node]
+
+    def __bool__(self) -> bool:
+        return bool(self.instances or self.nodes)
+
+
+class ClusterSnapshot:
+    """Local copy of the instances and nodes of a cluster that can be refreshed incrementally.
+
+    A refresh fetches only ``name``, ``serial_no`` and ``mtime`` of all objects, and then the full
+    objects that are new or changed: one by one if there are at most ``max_single_fetches`` of
+    them, with one query filtered by name otherwise. ``serial_no`` and ``mtime`` only change with
+    the configuration, so the runtime fields (INSTANCE_RUNTIME_FIELDS, NODE_RUNTIME_FIELDS, e.g.
+    ``status`` and ``mfree``) are fetched for all objects and updated in place; objects whose
+    runtime fields differ are reported as changed. Other runtime values, like ``pinst_cnt`` of
+    nodes, are only as current as the last configuration change.
+    """
+
+    def __init__(self, api_client: BaseApiClient, max_single_fetches: int = 20):
+        self.instance_service = InstanceService(api_client)
+        self.node_service = NodeService(api_client)
+        self.query_service = QueryService(api_client)
+        self.max_single_fetches = max_single_fetches
+        self.instances: dict[str, InstanceInfo] = {}
+        self.nodes: dict[str, Node] = {}
+
+    def refresh(self) -> SnapshotChanges:
+        """Bring the snapshot up to date and return what changed since the last refresh."""
+        return SnapshotChanges(
+            instances=self._refresh(
+                self.instances,
+                self.instance_service.get_partial_instances(VERSION_FIELDS + INSTANCE_RUNTIME_FIELDS),
+                INSTANCE_RUNTIME_FIELDS,
+                self.instance_service.get_instance,
+                lambda names: self.query_service.query_instances(any_of("name", names)),
+            ),
+            nodes=self._refresh(
+                self.nodes,
+                self.node_service.get_partial_nodes(VERSION_FIELDS + NODE_RUNTIME_FIELDS),
+                NODE_RUNTIME_FIELDS,
+                self.node_service.get_node,
+                lambda names: self.query_service.query_nodes(any_of("name", names)),
+            ),
+        )
+
+    def _refresh(
+        self,
+        known: dict[str, T],
+        versions: list[Record],
+        runtime_fields: Sequence[str],
+        fetch_one: Callable[[str], T],
+        fetch_many: Callable[[list[str]], list[T]],
+    ) -> ChangeSet[T]:
+        changes: ChangeSet[T] = ChangeSet()
+        current = {version.name for version in versions}
+        for name in sorted(set(known) - current):
+            del known[name]
+            changes.removed.append(name)
+
+        outdated = []
+        for version in versions:
+            obj = known.get(version.name)
+            if obj is None or (obj.serial_no, obj.mtime) != (version.serial_no, version.mtime):
+                outdated.append(version.name)
+                continue
+            runtime = {name: getattr(version, name) for name in runtime_fields}
+            if any(getattr(obj, name) != value for name, value in runtime.items()):
+                known[version.name] = dataclasses.replace(obj, **runtime)  # type: ignore[type-var]
+                changes.changed.append(known[version.name])
+        if not outdated:
+            return changes
+
+        fetched: list[T] = []
+        if len(outdated) <= self.max_single_fetches:
+            for name in outdated:
+                try:
+                    fetched.append(fetch_one(name))
+                except ResourceNotFoundError:
+                    # deleted in the meantime, dropped with the next refresh
+                    continue
+        else:
+            fetched = fetch_many(outdated)
+
+        for obj in fetched:
+            (changes.changed if obj.name in known else changes.added).append(obj)
+            known[obj.name] = obj
+        return changes
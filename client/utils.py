@@ -1,24 +1,124 @@
-from dataclasses import fields, is_dataclass
-from typing import Any, Dict, List, Type, TypeVar, Union, cast
+import codecs
+import json
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union, cast
 
 T = TypeVar("T")  # generic type for any dataclass
 
 
-def dict_to_dataclass(cls: Type[T], data: Dict[str, Any]) -> T:
-    """Convert a dict to a dataclass recursively."""
-    if not is_dataclass(cls):
-        raise TypeError(f"{cls} is not a dataclass type")
+@dataclass
+class _DecodePlan:
+    """How to build a dataclass from a dict, computed once per class."""
+
+    field_names: frozenset[str]
+    # nested dataclass type by field name
+    nested: Dict[str, type]
+    # fields whose string values are interned
+    interned: frozenset[str]
+    # fields whose string values are interned in compact mode
+    compact: frozenset[str]
+    # field name by key of the input dict, None for keys without field; learned on first use
+    key_map: Dict[str, Optional[str]]
+
+    def field_for_key(self, key: str) -> Optional[str]:
+        # replace . with _ in keynames e.g. nic.ips -> nic_ips
+        name = key.replace(".", "_")
+        self.key_map[key] = name if name in self.field_names else None
+        return self.key_map[key]
+
+
+_DECODE_PLANS: Dict[type, _DecodePlan] = {}
+# the rest of a buffer that may still belong to a number, e.g. "." or "e" of a split float
+_NUMBER_TAIL = re.compile(r"[0-9+\-.eE]*\Z")
+
+
+def _get_decode_plan(cls: type) -> _DecodePlan:
+    plan = _DECODE_PLANS.get(cls)
+    if plan is None:
+        if not is_dataclass(cls):
+            raise TypeError(f"{cls} is not a dataclass type")
+        cls_fields = fields(cls)
+        interned = frozenset(getattr(cls, "INTERNED_FIELDS", ()))
+        plan = _DecodePlan(
+            field_names=frozenset(f.name for f in cls_fields),
+            nested={f.name: cast(type, f.type) for f in cls_fields if is_dataclass(f.type)},
+            interned=interned,
+            compact=interned | frozenset(getattr(cls, "COMPACT_FIELDS", ())),
+            key_map={},
+        )
+        _DECODE_PLANS[cls] = plan
+    return plan
+
+
+def dict_to_dataclass(cls: Type[T], data: Dict[str, Any], compact: bool = False) -> T:
+    """Convert a dict to a dataclass recursively.
+
+    Keys in RAPI notation are mapped to their field, e.g. nic.ips -> nic_ips; keys without
+    field are ignored. The field layout of each class is inspected only once.
+
+    Strings in the fields listed in the ``INTERNED_FIELDS`` class attribute are interned, also
+    inside lists, so objects share repeated values such as node names. With ``compact`` the
+    fields in ``COMPACT_FIELDS`` are interned too, including dict values; this saves more memory
+    for large inventories, but rebuilding these lists and dicts makes the conversion slower.
+    """
+    plan = _get_decode_plan(cls)
+    key_map = plan.key_map
+    nested = plan.nested
+    interned = plan.compact if compact else plan.interned
 
     kwargs: Dict[str, Any] = {}
-    for field in fields(cls):
-        if field.name in data:
-            if is_dataclass(field.type) and isinstance(data[field.name], dict):
-                kwargs[field.name] = dict_to_dataclass(cast(Type[T], field.type), data[field.name])
-            else:
-                kwargs[field.name] = data[field.name]
+    for key, value in data.items():
+        try:
+            name = key_map[key]
+        except KeyError:
+            name = plan.field_for_key(key)
+        if name is None:
+            continue
+        if nested and name in nested and isinstance(value, dict):
+            value = dict_to_dataclass(nested[name], value, compact)
+        elif interned and name in interned:
+            value = _intern(value)
+        kwargs[name] = value
     return cls(**kwargs)
 
 
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [sys.intern(item) if isinstance(item, str) else item for item in value]
+    if isinstance(value, dict):
+        return {key: sys.intern(item) if isinstance(item, str) else item for key, item in value.items()}
+    return value
+
+
+def with_slots(cls: Type[T]) -> Type[T]:
+    """Recreate a dataclass with ``__slots__`` to save the per-object ``__dict__``.
+
+    Equivalent to ``@dataclass(slots=True)``, which requires Python 3.10. Apply it on top of
+    ``@dataclass``.
+    """
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls} is not a dataclass type")
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    # default values live in the generated __init__, as class attributes they would clash with the slots
+    for name in (*field_names, "__dict__", "__weakref__"):
+        cls_dict.pop(name, None)
+    slotted_cls = type(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return cast(Type[T], slotted_cls)
+
+
+def normalize_keys(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace . with _ in key names, e.g. nic.ips -> nic_ips."""
+    return {key.replace(".", "_"): value for key, value in data.items()}
+
+
 def dataclass_to_dict(obj: Any) -> Union[Dict[str, Any], List[Any], Any]:
     """Convert a dataclass to a dict recursively."""
     if is_dataclass(obj):
@@ -33,3 +133,73 @@ def dataclass_to_dict(obj: Any) -> Union[Dict[str, Any], List[Any], Any]:
     if isinstance(obj, dict):
         return {k: dataclass_to_dict(v) for k, v in obj.items()}
     return obj
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Parse a UTF-8 encoded JSON array incrementally and yield its items.
+
+    Only the text of the item being parsed is kept in memory, not the whole document.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = next(chunks_iter, None)
+        eof = chunk is None
+        buffer = buffer[pos:] + text_decoder.decode(chunk or b"", final=eof)
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        """Skip whitespace and return the next character, empty at the end of the input."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    def end_of_array() -> None:
+        """Skip the closing bracket, only whitespace may follow it like in json.loads."""
+        nonlocal pos
+        pos += 1
+        if next_char():
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    if next_char() == "]":
+        end_of_array()
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+            # a number is complete once a character follows that can't be part of it
+            if buffer[pos] not in "-0123456789" or not _NUMBER_TAIL.match(buffer, end) or not read_more():
+                break
+        pos = end
+        yield item
+
+        delimiter = next_char()
+        if delimiter == "]":
+            end_of_array()
+            return
+        if delimiter != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        pos += 1
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from client.aio import AsyncGanetiRapiClient
+from client.exceptions import GanetiRAPIClientError, ResourceNotFoundError
+from client.models.instance import InstanceInfo
+from client.models.job import JOB_STATUS_RUNNING, JOB_STATUS_SUCCESS, Job
+from client.models.node import Node
+
+_TESTDATA_DIR = Path(__file__).parent.parent / "testdata"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+ClientFactory = Callable[[Handler], AsyncGanetiRapiClient]
+
+
+def _load(filename: str) -> Any:
+    with open(_TESTDATA_DIR / filename, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def requests_seen() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def async_client(requests_seen: list[httpx.Request]) -> ClientFactory:
+    """Create an async client whose transport is served by the given handler."""
+
+    def _create(handler: Handler) -> AsyncGanetiRapiClient:
+        def _record(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return handler(request)
+
+        client = AsyncGanetiRapiClient("localhost", "username", "password", ssl_verify=False)
+        client._client._client = httpx.AsyncClient(
+            auth=("username", "password"), transport=httpx.MockTransport(_record)
+        )
+        return client
+
+    return _create
+
+
+class TestAsyncGanetiRapiClient:
+    def test_get_instances(self, async_client: ClientFactory, requests_seen: list[httpx.Request]) -> None:
+        client = async_client(lambda request: httpx.Response(200, json=_load("v2_get_instances_bulk.json")))
+
+        async def _run() -> list[InstanceInfo]:
+            async with client:
+                return await client.instance_service.get_instances()
+
+        instances = asyncio.run(_run())
+
+        assert requests_seen[0].method == "GET"
+        assert requests_seen[0].url.path == "/2/instances"
+        assert requests_seen[0].url.params["bulk"] == "1"
+        assert [instance.name for instance in instances][0] == "instance1.example.com"
+        assert instances[0].nic_ips == ["192.168.1.101"]
+
+    def test_get_node(self, async_client: ClientFactory) -> None:
+        client = async_client(lambda request: httpx.Response(200, json=_load("v2_get_nodes_node.json")))
+
+        node = asyncio.run(client.node_service.get_node("node1.example.com"))
+
+        assert isinstance(node, Node)
+        assert node.group_uuid == "4d3bf3ba-972e-49b0-8680-f783fb07a048"
+
+    def test_start_instance(self, async_client: ClientFactory, requests_seen: list[httpx.Request]) -> None:
+        client = async_client(lambda request: httpx.Response(200, json=123))
+
+        job_id = asyncio.run(client.instance_service.start_instance("test-vm"))
+
+        assert job_id == 123
+        assert requests_seen[0].method == "PUT"
+        assert requests_seen[0].url.path == "/2/instances/test-vm/startup"
+
+    def test_error_response(self, async_client: ClientFactory) -> None:
+        client = async_client(
+            lambda request: httpx.Response(
+                404, json={"message": "Not Found", "explain": "Nothing matches the given URI"}
+            )
+        )
+
+        with pytest.raises(ResourceNotFoundError) as exc_info:
+            asyncio.run(client.node_service.get_node("missing"))
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.message == "Not Found: Nothing matches the given URI"
+
+    def test_transport_error(self, async_client: ClientFactory) -> None:
+        def _raise(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = async_client(_raise)
+
+        with pytest.raises(GanetiRAPIClientError):
+            asyncio.run(client.job_service.get_jobs())
+
+    def test_wait_for_job(self, async_client: ClientFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+        client = async_client(lambda request: httpx.Response(500))
+        running = Job(id=1, status=JOB_STATUS_RUNNING, ops=[], opstatus=[], opresult=[])
+        success = Job(id=1, status=JOB_STATUS_SUCCESS, ops=[], opstatus=[], opresult=[])
+        monkeypatch.setattr(client.job_service, "get_job_info", AsyncMock(side_effect=[running, success]))
+        sleep_mock = AsyncMock()
+        monkeypatch.setattr("client.aio.services.job_service.asyncio.sleep", sleep_mock)
+
+        result = asyncio.run(client.job_service.wait_for_job(1, poll_interval=2))
+
+        assert result is success
+        sleep_mock.assert_awaited_once_with(2)
@@ -7,6 +7,10 @@ import pytest
 
 from client import GanetiRapiClient
 from client.api_client import BaseApiClient
+from client.cluster_index import ClusterIndex
+from client.models.instance import InstanceInfo
+from client.models.node import Node
+from client.utils import dict_to_dataclass
 
 
 @pytest.fixture
@@ -51,6 +55,8 @@ def mock_response() -> Callable[[Any, int], MagicMock]:
     def _create_mock_response(data: Any, status_code: int = 200) -> MagicMock:
         response = MagicMock()
         response.status_code = status_code
+        response.headers = {}
+        response.is_redirect = False
         response.json.return_value = data or {}
         response.ok = status_code < 400
         return response
@@ -77,3 +83,13 @@ def mock_response_from_jsonfile(
             return mock_response(data, status_code)
 
     return _create_from_file
+
+
+@pytest.fixture
+def cluster_index(_testdata_dir: Path) -> ClusterIndex:
+    """Index of the nodes and instances of the bulk test data."""
+    with open(_testdata_dir / "v2_get_nodes_bulk.json", encoding="utf-8") as f:
+        nodes = [dict_to_dataclass(Node, node) for node in json.load(f)]
+    with open(_testdata_dir / "v2_get_instances_bulk.json", encoding="utf-8") as f:
+        instances = [dict_to_dataclass(InstanceInfo, instance) for instance in json.load(f)]
+    return ClusterIndex(nodes, instances)
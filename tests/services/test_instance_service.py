@@ -1,10 +1,13 @@
+from pathlib import Path
 from typing import Any, Callable
 from unittest.mock import MagicMock
 
 import pytest
 
 from client.api_client import BaseApiClient
-from client.models.instance import InstanceInfo
+from client.exceptions import JobFailedError, ResourceNotFoundError, ServerError
+from client.models.instance import InstanceInfo, NewInstance
+from client.models.job import JOB_STATUS_ERROR, JOB_STATUS_SUCCESS, Job, JobDependency
 from client.services.instance_service import InstanceService
 
 
@@ -131,3 +134,230 @@ class TestInstanceService:
         assert isinstance(instance, InstanceInfo)
         assert instance.name == "test.example.com"
         assert "192.168.1.100" in instance.nic_ips
+
+    def test_get_instances(
+        self,
+        instance_service: InstanceService,
+        mock_session: MagicMock,
+        mock_response_from_jsonfile: Callable[[str], MagicMock],
+    ) -> None:
+        """Test getting all instances with a single bulk request."""
+        mock_session.request.return_value = mock_response_from_jsonfile("v2_get_instances_bulk.json")
+
+        instances = instance_service.get_instances()
+
+        mock_session.request.assert_called_once()
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "GET"
+        assert call_args[0][1].endswith("/instances")
+        assert call_args[1]["params"] == {"bulk": 1}
+
+        assert len(instances) == 3
+        assert all(isinstance(instance, InstanceInfo) for instance in instances)
+        assert [instance.name for instance in instances] == [
+            "instance1.example.com",
+            "instance2.example.com",
+            "instance3.example.com",
+        ]
+        assert instances[1].nic_ips == ["192.168.1.102"]
+        assert instances[2].beparams.memory == 1024
+
+    def test_get_partial_instances(
+        self,
+        instance_service: InstanceService,
+        mock_session: MagicMock,
+        mock_response_from_jsonfile: Callable[[str], MagicMock],
+    ) -> None:
+        """Test getting selected fields of all instances."""
+        mock_session.request.return_value = mock_response_from_jsonfile("v2_get_instances_bulk_fields.json")
+
+        instances = instance_service.get_partial_instances(["name", "pnode", "status", "nic.ips"])
+
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "GET"
+        assert call_args[1]["params"] == {"bulk": 1, "fields": "name,pnode,status,nic.ips"}
+
+        assert len(instances) == 3
+        assert instances[0].name == "instance1.example.com"
+        assert instances[0]["pnode"] == "node1.example.com"
+        assert instances[2].nic_ips == ["192.168.1.103"]
+        with pytest.raises(AttributeError):
+            _ = instances[0].oper_ram
+
+    def test_iter_instances(
+        self, instance_service: InstanceService, mock_session: MagicMock, _testdata_dir: Path
+    ) -> None:
+        """Test streaming all instances from a bulk request."""
+        data = (_testdata_dir / "v2_get_instances_bulk.json").read_bytes()
+        response = MagicMock(ok=True)
+        response.iter_content.return_value = (data[i : i + 512] for i in range(0, len(data), 512))
+        mock_session.request.return_value = response
+
+        instances = instance_service.iter_instances()
+        mock_session.request.assert_not_called()
+        first = next(instances)
+
+        call_args = mock_session.request.call_args
+        assert call_args[1]["params"] == {"bulk": 1}
+        assert call_args[1]["stream"] is True
+        assert first.name == "instance1.example.com"
+        assert [instance.name for instance in instances] == ["instance2.example.com", "instance3.example.com"]
+        response.__exit__.assert_called_once()
+
+    def test_migrate_instances(self) -> None:
+        """Test submitting a batch of migrations with one failing submission."""
+        job_ids = {"vm1": 11, "vm2": 12, "vm3": 13}
+
+        def _put(endpoint: str, **kwargs: Any) -> int:
+            name = endpoint.split("/")[1]
+            if name == "vm2":
+                raise ResourceNotFoundError("Not found", 404, endpoint)
+            return job_ids[name]
+
+        api_client = MagicMock()
+        api_client.put.side_effect = _put
+        service = InstanceService(api_client)
+
+        results = service.migrate_instances(["vm1", "vm2", "vm3"], max_workers=2)
+
+        assert list(results) == ["vm1", "vm2", "vm3"]
+        assert results["vm1"].job_id == 11 and results["vm1"].ok
+        assert results["vm3"].job_id == 13 and results["vm3"].ok
+        assert results["vm2"].job_id is None and not results["vm2"].ok
+        assert isinstance(results["vm2"].error, ResourceNotFoundError)
+        assert sorted(call[0][0] for call in api_client.put.call_args_list) == [
+            "instances/vm1/migrate",
+            "instances/vm2/migrate",
+            "instances/vm3/migrate",
+        ]
+
+    def test_stop_instances_wait(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test waiting for all jobs of a batch together."""
+        api_client = MagicMock()
+        api_client.put.side_effect = lambda endpoint, **kwargs: {"instances/vm1/shutdown": 1}.get(endpoint, 2)
+        service = InstanceService(api_client)
+        service.job_service = MagicMock()
+        service.job_service.wait_for_jobs.return_value = iter(
+            [
+                MagicMock(id=2, status=JOB_STATUS_ERROR),
+                MagicMock(id=1, status=JOB_STATUS_SUCCESS),
+            ]
+        )
+
+        results = service.stop_instances(["vm1", "vm2"], wait=True, timeout=60)
+
+        service.job_service.wait_for_jobs.assert_called_once()
+        assert set(service.job_service.wait_for_jobs.call_args[0][0]) == {1, 2}
+        assert service.job_service.wait_for_jobs.call_args[1]["timeout"] == 60
+        assert results["vm1"].ok
+        assert results["vm1"].job.id == 1  # type: ignore[union-attr]
+        assert not results["vm2"].ok
+        assert results["vm2"].error is None
+
+    def test_start_instances_wait_timeout(self) -> None:
+        """Test jobs still running after the timeout are marked as failed."""
+        api_client = MagicMock()
+        api_client.put.side_effect = lambda endpoint, **kwargs: {"instances/vm1/startup": 1}.get(endpoint, 2)
+        service = InstanceService(api_client)
+
+        def _wait_for_jobs(job_ids: Any, **kwargs: Any) -> Any:
+            yield MagicMock(id=1, status=JOB_STATUS_SUCCESS)
+            raise TimeoutError("Jobs [2] timed out after 300 seconds")
+
+        service.job_service = MagicMock()
+        service.job_service.wait_for_jobs.side_effect = _wait_for_jobs
+
+        results = service.start_instances(["vm1", "vm2"], wait=True)
+
+        assert results["vm1"].ok
+        assert isinstance(results["vm2"].error, TimeoutError)
+        assert results["vm2"].job_id == 2
+
+    def test_migrate_instances_wait_error(self) -> None:
+        """Test an error while waiting keeps the submitted job ids."""
+        api_client = MagicMock()
+        api_client.put.side_effect = lambda endpoint, **kwargs: {"instances/a/migrate": 11}.get(endpoint, 12)
+        service = InstanceService(api_client)
+        service.job_service = MagicMock()
+        service.job_service.wait_for_jobs.side_effect = ServerError("Bad Gateway", 502, "query/job")
+
+        results = service.migrate_instances(["a", "b"], wait=True)
+
+        assert results["a"].job_id == 11
+        assert results["b"].job_id == 12
+        assert all(isinstance(result.error, ServerError) for result in results.values())
+
+    def test_create_instances(
+        self, instance_service: InstanceService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        """Test creating many instances with a single multi-allocation job."""
+        mock_session.request.return_value = mock_response(42, 200)
+        new_instances = [
+            NewInstance(name=f"vm{i}", disk_template="plain", disks=[{"size": 1024}], nics=[{}], os="debootstrap")
+            for i in range(2)
+        ]
+
+        job_id = instance_service.create_instances(new_instances, iallocator="hail")
+
+        assert job_id == 42
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "POST"
+        assert call_args[0][1].endswith("/2/instances-multi-alloc")
+        body = call_args[1]["json"]
+        assert body["iallocator"] == "hail"
+        assert body["opportunistic_locking"] is False
+        assert [instance["name"] for instance in body["instances"]] == ["vm0", "vm1"]
+        assert body["instances"][0]["mode"] == "create"
+        assert body["instances"][0]["disks"] == [{"size": 1024}]
+        assert body["instances"][0]["name_check"] is False
+        assert "pnode" not in body["instances"][0]
+
+    def test_get_multi_alloc_result(self) -> None:
+        """Test parsing the placement and creation jobs of a multi-allocation job."""
+        service = InstanceService(MagicMock())
+        service.job_service = MagicMock()
+        service.job_service.wait_for_job.return_value = Job(
+            id=42,
+            status=JOB_STATUS_SUCCESS,
+            ops=[{"OP_ID": "OP_INSTANCE_MULTI_ALLOC"}],
+            opstatus=["success"],
+            opresult=[
+                {
+                    "allocatable": ["vm0", "vm1"],
+                    "allocation_failed": ["vm2"],
+                    "jobs": [[True, 43], [False, "Queue is full"]],
+                }
+            ],
+        )
+
+        result = service.get_multi_alloc_result(42)
+
+        service.job_service.wait_for_job.assert_called_once_with(42, timeout=300, poll_interval=5, long_poll=True)
+        assert result.allocatable == ["vm0", "vm1"]
+        assert result.allocation_failed == ["vm2"]
+        assert result.instance_jobs == {"vm0": 43}
+
+    def test_get_multi_alloc_result_failed(self) -> None:
+        """Test a failed multi-allocation job raises."""
+        service = InstanceService(MagicMock())
+        service.job_service = MagicMock()
+        service.job_service.wait_for_job.return_value = Job(
+            id=42, status=JOB_STATUS_ERROR, ops=[], opstatus=["error"], opresult=[["OpPrereqError", ["No iallocator"]]]
+        )
+
+        with pytest.raises(JobFailedError) as exc:
+            service.get_multi_alloc_result(42)
+
+        assert exc.value.job_id == 42
+        assert exc.value.status == JOB_STATUS_ERROR
+
+    def test_grow_instance_disk_depends(
+        self, instance_service: InstanceService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        """Test an operation waiting for another job on the master."""
+        mock_session.request.return_value = mock_response(124, 200)
+
+        job_id = instance_service.grow_instance_disk("vm1", 0, 1024, depends=[JobDependency(123)])
+
+        assert job_id == 124
+        assert mock_session.request.call_args[1]["json"] == {"amount": 1024, "depends": [[123, ["success"]]]}
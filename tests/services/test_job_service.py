@@ -1,9 +1,20 @@
 from collections.abc import Iterator
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
-from client.models.job import JOB_STATUS_RUNNING, JOB_STATUS_SUCCESS, Job
+from client.exceptions import ResourceNotFoundError, ServerError
+from client.models.job import (
+    JOB_STATUS_ERROR,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCESS,
+    ChainStep,
+    Job,
+    JobDependency,
+    JobLogEntry,
+)
 from client.services.job_service import JobService
 
 
@@ -63,3 +74,185 @@ class TestJobService:
         assert get_job_info_mock_timeout.call_count == 1
         # sleep should not be called because timeout is detected before sleeping
         sleep_mock_timeout.assert_not_called()
+
+    def test_wait_for_job_long_poll(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        api_client = MagicMock()
+        api_client.get_with_body.side_effect = [
+            {"job_info": [JOB_STATUS_QUEUED], "log_entries": []},
+            None,  # no change within the server-side timeout
+            {"job_info": [JOB_STATUS_SUCCESS], "log_entries": []},
+        ]
+        service = JobService(api_client=api_client)
+        success = Job(id=1, status=JOB_STATUS_SUCCESS, ops=[], opstatus=[], opresult=[])
+        get_job_info_mock = MagicMock(return_value=success)
+        monkeypatch.setattr(service, "get_job_info", get_job_info_mock)
+        sleep_mock = MagicMock()
+        monkeypatch.setattr("client.services.job_service.time.sleep", sleep_mock)
+
+        result = service.wait_for_job(job_id=1, long_poll=True)
+
+        assert result is success
+        assert api_client.get_with_body.call_count == 3
+        endpoint = api_client.get_with_body.call_args_list[0][0][0]
+        assert endpoint == "jobs/1/wait"
+        assert api_client.get_with_body.call_args_list[0][1]["previous_job_info"] is None
+        assert api_client.get_with_body.call_args_list[2][1]["previous_job_info"] == [JOB_STATUS_QUEUED]
+        # full job info is only fetched once the job is finalized
+        get_job_info_mock.assert_called_once_with(1)
+        sleep_mock.assert_not_called()
+
+    def test_wait_for_job_long_poll_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        api_client = MagicMock()
+        api_client.get_with_body.side_effect = ResourceNotFoundError("Not Found", 404, "jobs/1/wait")
+        service = JobService(api_client=api_client)
+        running = Job(id=1, status=JOB_STATUS_RUNNING, ops=[], opstatus=[], opresult=[])
+        success = Job(id=1, status=JOB_STATUS_SUCCESS, ops=[], opstatus=[], opresult=[])
+        monkeypatch.setattr(service, "get_job_info", MagicMock(side_effect=[running, running, running, success]))
+        sleep_mock = MagicMock()
+        monkeypatch.setattr("client.services.job_service.time.sleep", sleep_mock)
+
+        result = service.wait_for_job(job_id=1, poll_interval=1, long_poll=True)
+
+        assert result is success
+        # polling interval grows up to poll_interval
+        assert [c[0][0] for c in sleep_mock.call_args_list] == [0.5, 1, 1]
+
+    def test_wait_for_job_long_poll_server_error(self) -> None:
+        api_client = MagicMock()
+        api_client.get_with_body.side_effect = ServerError("Internal Server Error", 500, "jobs/1/wait")
+        service = JobService(api_client=api_client)
+
+        with pytest.raises(ServerError):
+            service.wait_for_job(job_id=1, long_poll=True)
+
+    def test_wait_for_jobs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def _job_row(job_id: int, status: str) -> list[list[Any]]:
+            return [[0, job_id], [0, status], [0, []], [0, []], [0, []]]
+
+        api_client = MagicMock(retry_policy=None)
+        api_client.put.side_effect = [
+            # first poll: job 1 finished, details of job 1
+            {"data": [[[0, 1], [0, JOB_STATUS_SUCCESS]], [[0, 2], [0, JOB_STATUS_RUNNING]], [[0, 3], [0, "queued"]]]},
+            {"data": [_job_row(1, JOB_STATUS_SUCCESS)]},
+            # second poll: jobs 2 and 3 finished, details of both
+            {"data": [[[0, 2], [0, JOB_STATUS_ERROR]], [[0, 3], [0, JOB_STATUS_SUCCESS]]]},
+            {"data": [_job_row(2, JOB_STATUS_ERROR), _job_row(3, JOB_STATUS_SUCCESS)]},
+        ]
+        service = JobService(api_client=api_client)
+        monkeypatch.setattr("client.services.job_service.time.time", _time_seq([1000.0, 1001.0]))
+        sleep_mock = MagicMock()
+        monkeypatch.setattr("client.services.job_service.time.sleep", sleep_mock)
+
+        jobs = list(service.wait_for_jobs([3, 2, 1], timeout=300, poll_interval=5))
+
+        assert [(job.id, job.status) for job in jobs] == [
+            (1, JOB_STATUS_SUCCESS),
+            (2, JOB_STATUS_ERROR),
+            (3, JOB_STATUS_SUCCESS),
+        ]
+        # two requests per poll, regardless of the number of jobs
+        assert api_client.put.call_count == 4
+        endpoint = api_client.put.call_args_list[0][0][0]
+        assert endpoint == "query/job"
+        assert api_client.put.call_args_list[0][1]["fields"] == ["id", "status"]
+        assert api_client.put.call_args_list[2][1]["qfilter"] == ["|", ["=", "id", 2], ["=", "id", 3]]
+        sleep_mock.assert_called_once_with(5)
+
+    def test_wait_for_jobs_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        api_client = MagicMock(retry_policy=None)
+        api_client.put.return_value = {"data": [[[0, 1], [0, JOB_STATUS_RUNNING]]]}
+        service = JobService(api_client=api_client)
+        monkeypatch.setattr("client.services.job_service.time.time", _time_seq([1000.0, 1301.0]))
+        monkeypatch.setattr("client.services.job_service.time.sleep", MagicMock())
+
+        with pytest.raises(TimeoutError) as exc:
+            list(service.wait_for_jobs([1], timeout=300))
+
+        assert "Jobs [1] timed out after 300 seconds" in str(exc.value)
+
+    def test_submit_chain(self) -> None:
+        service = JobService(api_client=MagicMock())
+        calls: list[Any] = []
+
+        def _step(job_id: int) -> Any:
+            def _submit(depends: Any = None) -> int:
+                calls.append(depends)
+                return job_id
+
+            return _submit
+
+        job_ids = service.submit_chain(
+            [
+                _step(10),
+                _step(11),
+                # depends on the first job with any final status
+                ChainStep(_step(12), depends=[JobDependency(-2, statuses=[])]),
+                ChainStep(_step(13), depends=[JobDependency(5), JobDependency(-1)]),
+            ]
+        )
+
+        assert job_ids == [10, 11, 12, 13]
+        assert calls == [
+            None,
+            [JobDependency(10)],
+            [JobDependency(10, [])],
+            [JobDependency(5), JobDependency(12)],
+        ]
+
+    def test_submit_chain_invalid_dependency(self) -> None:
+        service = JobService(api_client=MagicMock())
+
+        with pytest.raises(ValueError):
+            service.submit_chain([ChainStep(MagicMock(return_value=1), depends=[JobDependency(-1)])])
+
+    def test_job_dependency_to_json(self) -> None:
+        assert JobDependency(7).to_json() == [7, [JOB_STATUS_SUCCESS]]
+        with pytest.raises(ValueError):
+            JobDependency(-1).to_json()
+
+    def test_stream_job_log(self) -> None:
+        api_client = MagicMock()
+        api_client.get_with_body.side_effect = [
+            {"job_info": [JOB_STATUS_RUNNING], "log_entries": [[1, [1700000000, 500000], "message", "Migrating"]]},
+            None,
+            {
+                "job_info": [JOB_STATUS_SUCCESS],
+                "log_entries": [
+                    [2, [1700000001, 0], "message", "Memory transfer 50%"],
+                    [3, [1700000002, 0], "message", "Migration done"],
+                ],
+            },
+        ]
+        service = JobService(api_client=api_client)
+
+        entries = list(service.stream_job_log(1))
+
+        assert entries == [
+            JobLogEntry(1, 1700000000.5, "message", "Migrating"),
+            JobLogEntry(2, 1700000001.0, "message", "Memory transfer 50%"),
+            JobLogEntry(3, 1700000002.0, "message", "Migration done"),
+        ]
+        calls = api_client.get_with_body.call_args_list
+        assert calls[0][1]["previous_log_serial"] is None
+        # only entries after the last received one are requested
+        assert calls[1][1]["previous_log_serial"] == 1
+        assert calls[2][1]["previous_job_info"] == [JOB_STATUS_RUNNING]
+
+    def test_stream_job_log_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        api_client = MagicMock()
+        api_client.get_with_body.side_effect = ResourceNotFoundError("Not Found", 404, "jobs/1/wait")
+        api_client.get.side_effect = [
+            {"status": JOB_STATUS_RUNNING, "oplog": [[[1, [1700000000, 0], "message", "one"]]]},
+            {
+                "status": JOB_STATUS_SUCCESS,
+                "oplog": [[[1, [1700000000, 0], "message", "one"]], [[2, [1700000001, 0], "message", "two"]]],
+            },
+        ]
+        service = JobService(api_client=api_client)
+        sleep_mock = MagicMock()
+        monkeypatch.setattr("client.services.job_service.time.sleep", sleep_mock)
+
+        entries = list(service.stream_job_log(1, poll_interval=2))
+
+        assert [(entry.serial, entry.message) for entry in entries] == [(1, "one"), (2, "two")]
+        sleep_mock.assert_called_once_with(2)
@@ -1,10 +1,10 @@
-from typing import Callable
+from typing import Any, Callable
 from unittest.mock import MagicMock
 
 import pytest
 
 from client.api_client import BaseApiClient
-from client.models.node import Node
+from client.models.node import NODE_EVAC_PRIMARY, NODE_MIGRATION_LIVE, NODE_ROLE_DRAINED, Node
 from client.services.node_service import NodeService
 
 
@@ -48,3 +48,83 @@ class TestNodeService:
         assert node.name == "node1.example.com"
         assert node.pip == "192.168.1.200"
         assert node.group_uuid == "4d3bf3ba-972e-49b0-8680-f783fb07a048"
+
+    def test_get_nodes(
+        self,
+        node_service: NodeService,
+        mock_session: MagicMock,
+        mock_response_from_jsonfile: Callable[[str], MagicMock],
+    ) -> None:
+        mock_session.request.return_value = mock_response_from_jsonfile("v2_get_nodes_bulk.json")
+
+        nodes = node_service.get_nodes()
+
+        mock_session.request.assert_called_once()
+        assert mock_session.request.call_args[1]["params"] == {"bulk": 1}
+        assert [node.name for node in nodes] == ["node1.example.com", "node2.example.com", "node3.example.com"]
+        assert all(isinstance(node, Node) for node in nodes)
+        assert nodes[1].group_uuid == "4d3bf3ba-972e-49b0-8680-f783fb07a048"
+
+    def test_get_partial_nodes(
+        self, node_service: NodeService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(
+            [{"name": "node1.example.com", "mfree": 1024, "group.uuid": "4d3bf3ba"}], 200
+        )
+
+        nodes = node_service.get_partial_nodes(["name", "mfree", "group.uuid"])
+
+        assert mock_session.request.call_args[1]["params"] == {"bulk": 1, "fields": "name,mfree,group.uuid"}
+        assert nodes[0].name == "node1.example.com"
+        assert nodes[0].mfree == 1024
+        assert nodes[0].group_uuid == "4d3bf3ba"
+
+    def test_get_node_role(
+        self, node_service: NodeService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response("master-candidate", 200)
+
+        role = node_service.get_node_role("node1.example.com")
+
+        assert role == "master-candidate"
+        assert mock_session.request.call_args[0][1] == "https://localhost/2/nodes/node1.example.com/role"
+
+    def test_set_node_role(
+        self, node_service: NodeService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(123, 200)
+
+        job_id = node_service.set_node_role("node1.example.com", NODE_ROLE_DRAINED, force=True)
+
+        assert job_id == 123
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "PUT"
+        # the body is the role itself, not an object
+        assert call_args[1]["json"] == "drained"
+        assert call_args[1]["params"] == {"force": 1}
+
+    def test_evacuate_node(
+        self, node_service: NodeService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(124, 200)
+
+        job_id = node_service.evacuate_node("node1.example.com", mode=NODE_EVAC_PRIMARY, iallocator="hail")
+
+        assert job_id == 124
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "POST"
+        assert call_args[0][1] == "https://localhost/2/nodes/node1.example.com/evacuate"
+        assert call_args[1]["json"] == {"mode": "primary-only", "early_release": False, "iallocator": "hail"}
+
+    def test_migrate_node(
+        self, node_service: NodeService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(125, 200)
+
+        job_id = node_service.migrate_node("node1.example.com", mode=NODE_MIGRATION_LIVE)
+
+        assert job_id == 125
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "POST"
+        assert call_args[0][1] == "https://localhost/2/nodes/node1.example.com/migrate"
+        assert call_args[1]["json"] == {"mode": "live"}
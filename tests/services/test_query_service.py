@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from client.api_client import BaseApiClient
+from client.models.instance import INSTANCE_FIELDS, InstanceInfo
+from client.models.node import NODE_FIELDS, Node
+from client.query_filter import eq
+from client.retry import RetryPolicy
+from client.services.query_service import QueryService
+
+
+@pytest.fixture
+def query_service(api_client: BaseApiClient) -> QueryService:
+    return QueryService(api_client)
+
+
+class TestQueryService:
+    def test_query(
+        self, query_service: QueryService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(
+            {
+                "fields": [{"name": "name"}, {"name": "oper_ram"}, {"name": "nic.ips"}],
+                "data": [[[0, "vm1"], [0, 1024], [0, ["10.0.0.1"]]], [[0, "vm2"], [2, None], [0, []]]],
+            },
+            200,
+        )
+
+        rows = query_service.query(
+            "instance", ["name", "oper_ram", "nic.ips"], eq("pnode", "node1") & eq("status", "running")
+        )
+
+        call_args = mock_session.request.call_args
+        assert call_args[0][0] == "PUT"
+        assert call_args[0][1].endswith("/query/instance")
+        assert call_args[1]["json"] == {
+            "fields": ["name", "oper_ram", "nic.ips"],
+            "qfilter": ["&", ["=", "pnode", "node1"], ["=", "status", "running"]],
+        }
+        assert rows[0].name == "vm1"
+        assert rows[0].nic_ips == ["10.0.0.1"]
+        # fields without data are None
+        assert rows[1].oper_ram is None
+
+    def test_query_is_retried(
+        self,
+        query_service: QueryService,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("client.api_client.time.sleep", MagicMock())
+        api_client.retry_policy = RetryPolicy()
+        mock_session.request.side_effect = [
+            mock_response({"message": "Bad Gateway"}, 502),
+            mock_response({"fields": [{"name": "id"}], "data": [[[0, 11]]]}, 200),
+        ]
+
+        rows = query_service.query("job", ["id"], eq("id", 11))
+
+        assert rows[0].id == 11
+        assert mock_session.request.call_count == 2
+        # other PUT requests submit jobs and are still not retried
+        assert not api_client.retry_policy.can_retry("PUT", 1)
+
+    def test_query_without_filter(
+        self, query_service: QueryService, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response({"fields": [{"name": "name"}], "data": [[[0, "node1"]]]}, 200)
+
+        rows = query_service.query("node", ["name"])
+
+        assert mock_session.request.call_args[1]["json"] == {"fields": ["name"]}
+        assert rows == [{"name": "node1"}]
+
+    def test_query_instances(
+        self,
+        query_service: QueryService,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        _testdata_dir: Path,
+    ) -> None:
+        with open(_testdata_dir / "v2_get_instances_instance.json", encoding="utf-8") as f:
+            instance_raw = json.load(f)
+        mock_session.request.return_value = mock_response(
+            {"fields": [], "data": [[[0, instance_raw[field]] for field in INSTANCE_FIELDS]]}, 200
+        )
+
+        instances = query_service.query_instances(eq("pnode", "node01.example.com"))
+
+        assert mock_session.request.call_args[1]["json"]["fields"] == INSTANCE_FIELDS
+        assert isinstance(instances[0], InstanceInfo)
+        assert instances[0].name == "test.example.com"
+        assert instances[0].nic_ips == ["192.168.1.100"]
+        assert instances[0].beparams.memory == 1024
+
+    def test_query_nodes(
+        self,
+        query_service: QueryService,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        _testdata_dir: Path,
+    ) -> None:
+        with open(_testdata_dir / "v2_get_nodes_node.json", encoding="utf-8") as f:
+            node_raw = json.load(f)
+        mock_session.request.return_value = mock_response(
+            {"fields": [], "data": [[[0, node_raw[field]] for field in NODE_FIELDS]]}, 200
+        )
+
+        nodes = query_service.query_nodes(eq("name", node_raw["name"]))
+
+        assert mock_session.request.call_args[0][1].endswith("/query/node")
+        assert nodes == [Node(**{key.replace(".", "_"): value for key, value in node_raw.items()})]
@@ -1,8 +1,11 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
 from client.api_client import BaseApiClient
 from client.exceptions import (
@@ -84,3 +87,64 @@ class TestErrorHandling:
                 api_client.get("/dummy")
 
             assert "Client Error" in str(exc_info.value)
+
+    def test_timeout_is_sent(
+        self, api_client: BaseApiClient, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        api_client.timeout = 3
+        mock_session.request.return_value = mock_response({}, 200)
+
+        api_client.get("instances")
+        api_client.get_with_body("jobs/1/wait", min_timeout=15, fields=["status"])
+
+        assert [call.kwargs["timeout"] for call in mock_session.request.call_args_list] == [3, 15]
+
+    def test_stream_error(self, api_client: BaseApiClient, mock_session: MagicMock) -> None:
+        def _chunks() -> Iterator[bytes]:
+            yield b'[{"id": 1},'
+            raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+        response = MagicMock(ok=True)
+        response.iter_content.return_value = _chunks()
+        mock_session.request.return_value = response
+
+        items = api_client.iter_get("jobs", bulk=1)
+
+        assert next(items) == {"id": 1}
+        with pytest.raises(GanetiRAPIClientError):
+            next(items)
+
+
+class TestConnectionPooling:
+    def test_default_pool(self) -> None:
+        client = BaseApiClient("localhost", "username", "password")
+
+        adapter = client._session.get_adapter("https://localhost/2/info")
+
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == 10  # type: ignore[attr-defined]
+        assert adapter._pool_block is False  # type: ignore[attr-defined]
+        assert client._session.headers["Connection"] == "keep-alive"
+
+    def test_pool_options(self) -> None:
+        client = BaseApiClient(
+            "localhost", "username", "password", pool_connections=2, pool_maxsize=32, pool_block=True, keep_alive=False
+        )
+
+        adapter = client._session.get_adapter("https://localhost/2/info")
+
+        assert adapter._pool_connections == 2  # type: ignore[attr-defined]
+        assert adapter._pool_maxsize == 32  # type: ignore[attr-defined]
+        assert adapter._pool_block is True  # type: ignore[attr-defined]
+        assert client._session.headers["Connection"] == "close"
+
+    def test_shared_between_threads(
+        self, api_client: BaseApiClient, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.side_effect = lambda method, url, **kwargs: mock_response({"url": url}, 200)
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(lambda i: api_client.get(f"jobs/{i}"), range(256)))
+
+        assert [result["url"] for result in results] == [f"https://localhost/2/jobs/{i}" for i in range(256)]
+        assert mock_session.request.call_count == 256
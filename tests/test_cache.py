@@ -0,0 +1,163 @@
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from client.api_client import BaseApiClient
+from client.cache import ResponseCache
+
+
+@pytest.fixture
+def now(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Control the clock of the cache, advance it by changing now[0]."""
+    clock = [1000.0]
+    monkeypatch.setattr("client.cache.time.monotonic", lambda: clock[0])
+    return clock
+
+
+class TestResponseCache:
+    def test_ttl(self, now: list[float]) -> None:
+        cache = ResponseCache(ttls={"nodes/{name}": 30, "instances/{name}": 5})
+
+        cache.set("nodes/node1", {}, {"name": "node1"})
+        cache.set("instances/vm1", {}, {"name": "vm1"})
+        cache.set("instances/vm1/info", {}, 42)
+        cache.set("jobs/1", {}, {"id": 1})
+
+        assert cache.get("nodes/node1", {}) == {"name": "node1"}
+        assert cache.get("instances/vm1", {}) == {"name": "vm1"}
+        assert cache.get("instances/vm1/info", {}) is None
+        assert cache.get("jobs/1", {}) is None
+        now[0] += 10
+        assert cache.get("nodes/node1", {}) == {"name": "node1"}
+        assert cache.get("instances/vm1", {}) is None
+
+    def test_default_ttls_skip_endpoints_submitting_jobs(self, now: list[float]) -> None:
+        cache = ResponseCache()
+
+        assert cache.get_ttl("instances") > 0
+        assert cache.get_ttl("instances/vm1") > 0
+        assert cache.get_ttl("nodes/node1") > 0
+        assert cache.get_ttl("instances/vm1/info") == 0
+        assert cache.get_ttl("instances/vm1/console") == 0
+        assert cache.get_ttl("nodes/node1/role") == 0
+
+    def test_params_are_part_of_the_key(self, now: list[float]) -> None:
+        cache = ResponseCache()
+
+        cache.set("instances", {"bulk": 1}, [{"name": "vm1"}])
+
+        assert cache.get("instances", {"bulk": 1}) == [{"name": "vm1"}]
+        assert cache.get("instances", {}) is None
+
+    def test_lru_eviction(self, now: list[float]) -> None:
+        cache = ResponseCache(maxsize=2)
+
+        cache.set("nodes/node1", {}, 1)
+        cache.set("nodes/node2", {}, 2)
+        cache.get("nodes/node1", {})
+        cache.set("nodes/node3", {}, 3)
+
+        assert len(cache) == 2
+        assert cache.get("nodes/node1", {}) == 1
+        assert cache.get("nodes/node2", {}) is None
+
+    def test_returns_copies(self, now: list[float]) -> None:
+        cache = ResponseCache()
+        cache.set("nodes/node1", {}, {"tags": ["a"]})
+
+        cache.get("nodes/node1", {})["tags"].append("b")
+
+        assert cache.get("nodes/node1", {}) == {"tags": ["a"]}
+
+    def test_invalidate(self, now: list[float]) -> None:
+        cache = ResponseCache()
+        cache.set("instances", {"bulk": 1}, [])
+        cache.set("instances/vm1", {}, {"name": "vm1"})
+        cache.set("instances/vm1/info", {"static": 0}, 7)
+        cache.set("instances/vm10", {}, {"name": "vm10"})
+        cache.set("nodes/node1", {}, {"name": "node1"})
+
+        cache.invalidate("instances/vm1/migrate")
+
+        assert cache.get("instances", {"bulk": 1}) is None
+        assert cache.get("instances/vm1", {}) is None
+        assert cache.get("instances/vm1/info", {"static": 0}) is None
+        assert cache.get("instances/vm10", {}) == {"name": "vm10"}
+        assert cache.get("nodes/node1", {}) == {"name": "node1"}
+
+    def test_invalidate_multi_alloc(self, now: list[float]) -> None:
+        cache = ResponseCache()
+        cache.set("instances", {"bulk": 1}, [])
+        cache.set("instances/vm1", {}, {"name": "vm1"})
+
+        cache.invalidate("instances-multi-alloc")
+
+        assert cache.get("instances", {"bulk": 1}) is None
+        assert cache.get("instances/vm1", {}) == {"name": "vm1"}
+
+    @pytest.mark.parametrize("action", ["evacuate", "migrate"])
+    def test_invalidate_node_operations(self, now: list[float], action: str) -> None:
+        cache = ResponseCache()
+        cache.set("instances", {"bulk": 1}, [])
+        cache.set("instances/vm1", {}, {"name": "vm1"})
+        cache.set("nodes/node1", {}, {"name": "node1"})
+        cache.set("nodes/node2", {}, {"name": "node2"})
+
+        cache.invalidate(f"nodes/node1/{action}")
+
+        assert len(cache) == 1
+        assert cache.get("nodes/node2", {}) == {"name": "node2"}
+
+    def test_serial_no(self, now: list[float]) -> None:
+        cache = ResponseCache()
+        cache.set("instances/vm1", {}, {"name": "vm1", "serial_no": 4})
+        cache.set("instances/vm2", {}, {"name": "vm2", "serial_no": 7})
+
+        assert cache.is_stale("instances/vm1", 5)
+        assert not cache.is_stale("instances/vm1", 4)
+
+        # a listing with a newer serial_no drops the outdated object
+        cache.set("instances", {"bulk": 1}, [{"name": "vm1", "serial_no": 5}, {"name": "vm2", "serial_no": 7}])
+
+        assert cache.get("instances/vm1", {}) is None
+        assert cache.get("instances/vm2", {}) == {"name": "vm2", "serial_no": 7}
+
+
+class TestCachedApiClient:
+    def test_get_is_cached_until_modified(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        now: list[float],
+    ) -> None:
+        api_client.cache = ResponseCache()
+        mock_session.request.side_effect = [
+            mock_response({"name": "vm1", "serial_no": 1}, 200),
+            mock_response(123, 200),
+            mock_response({"name": "vm1", "serial_no": 2}, 200),
+        ]
+
+        assert api_client.get("instances/vm1") == {"name": "vm1", "serial_no": 1}
+        assert api_client.get("instances/vm1") == {"name": "vm1", "serial_no": 1}
+        assert mock_session.request.call_count == 1
+
+        api_client.put("instances/vm1/modify", beparams={"memory": 2048})
+
+        assert api_client.get("instances/vm1") == {"name": "vm1", "serial_no": 2}
+        assert mock_session.request.call_count == 3
+
+    def test_instance_info_is_not_cached(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        now: list[float],
+    ) -> None:
+        api_client.cache = ResponseCache()
+        mock_session.request.side_effect = [mock_response(101, 200), mock_response(102, 200)]
+
+        assert api_client.get("instances/vm1/info") == 101
+        assert api_client.get("instances/vm1/info") == 102
+        assert mock_session.request.call_count == 2
@@ -0,0 +1,80 @@
+import dataclasses
+
+import pytest
+
+from client.capacity import plan_evacuation
+from client.cluster_index import ClusterIndex
+from client.models.node import NODE_EVAC_PRIMARY, NODE_EVAC_SECONDARY
+
+
+def _replace_node(cluster_index: ClusterIndex, name: str, **changes: object) -> None:
+    cluster_index.put_node(dataclasses.replace(cluster_index.nodes[name], **changes))  # type: ignore[arg-type]
+
+
+class TestPlanEvacuation:
+    def test_fits(self, cluster_index: ClusterIndex) -> None:
+        plan = plan_evacuation(cluster_index, "node1.example.com")
+
+        assert plan.fits
+        # the primary fails over to its secondary, the secondary can't move to the primary node3
+        assert plan.placements == {
+            "instance1.example.com": "node2.example.com",
+            "instance3.example.com": "node2.example.com",
+        }
+        # the failed over primary needs a new secondary besides node2
+        assert plan.secondary_placements == {"instance1.example.com": "node3.example.com"}
+        assert plan.memory_required == 1024
+        assert plan.disk_required == 2 * 26880
+        assert plan.memory_available == 93141 + 83141
+        assert plan.disk_available == 171143 + 151143
+
+    def test_modes(self, cluster_index: ClusterIndex) -> None:
+        primary = plan_evacuation(cluster_index, "node1.example.com", mode=NODE_EVAC_PRIMARY)
+        secondary = plan_evacuation(cluster_index, "node1.example.com", mode=NODE_EVAC_SECONDARY)
+
+        assert list(primary.placements) == ["instance1.example.com"]
+        assert list(secondary.placements) == ["instance3.example.com"]
+
+    def test_does_not_fit(self, cluster_index: ClusterIndex) -> None:
+        _replace_node(cluster_index, "node2.example.com", mfree=512, dfree=1024)
+
+        plan = plan_evacuation(cluster_index, "node1.example.com")
+
+        assert not plan.fits
+        assert plan.unplaced == ["instance1.example.com", "instance3.example.com"]
+
+    def test_unavailable_nodes_are_skipped(self, cluster_index: ClusterIndex) -> None:
+        _replace_node(cluster_index, "node2.example.com", drained=True)
+
+        plan = plan_evacuation(cluster_index, "node1.example.com")
+
+        assert plan.unplaced == ["instance1.example.com", "instance3.example.com"]
+        assert plan.memory_available == 83141
+
+    def test_primary_mode_keeps_the_secondary(self, cluster_index: ClusterIndex) -> None:
+        plan = plan_evacuation(cluster_index, "node1.example.com", mode=NODE_EVAC_PRIMARY)
+
+        assert plan.placements == {"instance1.example.com": "node2.example.com"}
+        assert not plan.secondary_placements
+        assert plan.disk_required == 0
+
+    @pytest.mark.parametrize("disk_template", ["plain", "file"])
+    def test_local_disks_are_not_relocated(self, cluster_index: ClusterIndex, disk_template: str) -> None:
+        instance = cluster_index.instances["instance1.example.com"]
+        cluster_index.put_instance(dataclasses.replace(instance, snodes=[], disk_template=disk_template))
+
+        plan = plan_evacuation(cluster_index, "node1.example.com", mode=NODE_EVAC_PRIMARY)
+
+        assert not plan.fits
+        assert plan.unplaced == ["instance1.example.com"]
+
+    def test_shared_storage(self, cluster_index: ClusterIndex) -> None:
+        instance = cluster_index.instances["instance1.example.com"]
+        cluster_index.put_instance(dataclasses.replace(instance, snodes=[], disk_template="rbd"))
+        _replace_node(cluster_index, "node2.example.com", dfree=0)
+
+        plan = plan_evacuation(cluster_index, "node1.example.com", mode=NODE_EVAC_PRIMARY)
+
+        # placed on the node with the most free memory, its disks don't use local storage
+        assert plan.placements == {"instance1.example.com": "node2.example.com"}
+        assert plan.disk_required == 0
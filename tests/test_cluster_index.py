@@ -0,0 +1,81 @@
+import dataclasses
+
+from client.cluster_index import ClusterIndex
+from client.snapshot import ChangeSet, SnapshotChanges
+
+
+class TestClusterIndex:
+    def test_lookups(self, cluster_index: ClusterIndex) -> None:
+        instance = cluster_index.get_instance("instance1.example.com")
+        assert instance is not None
+        assert cluster_index.get_instance_by_uuid(instance.uuid) is instance
+        node = cluster_index.get_node("node1.example.com")
+        assert node is not None
+        assert cluster_index.get_node_by_uuid(node.uuid) is node
+        assert cluster_index.get_node("node9.example.com") is None
+
+        assert [i.name for i in cluster_index.get_primary_instances("node1.example.com")] == ["instance1.example.com"]
+        assert [i.name for i in cluster_index.get_secondary_instances("node1.example.com")] == ["instance3.example.com"]
+        assert cluster_index.get_secondary_peers("node1.example.com") == {"node2.example.com", "node3.example.com"}
+        assert len(cluster_index.get_group_nodes(node.group_uuid)) == 3
+        assert len(cluster_index.get_tagged_instances("managed:true")) == 3
+        assert len(cluster_index.get_tagged_nodes("environment:production")) == 3
+        assert cluster_index.get_tagged_instances("unknown") == []
+
+    def test_capacity(self, cluster_index: ClusterIndex) -> None:
+        capacity = cluster_index.get_node_capacity("node1.example.com")
+
+        assert capacity.mfree == 103141
+        assert capacity.dfree == 191143
+        assert capacity.ctotal == 12
+        assert capacity.committed_memory == 1024
+        assert capacity.committed_vcpus == 1
+        assert capacity.primary_instances == 1
+        assert capacity.secondary_instances == 1
+
+        node = cluster_index.get_node("node1.example.com")
+        assert node is not None
+        group = cluster_index.get_group_capacity(node.group_uuid)
+        assert group.nodes == 3
+        assert group.mfree == 103141 + 93141 + 83141
+        assert group.committed_memory == 3 * 1024
+
+    def test_incremental_update(self, cluster_index: ClusterIndex) -> None:
+        instance = cluster_index.get_instance("instance1.example.com")
+        assert instance is not None
+        moved = dataclasses.replace(
+            instance,
+            pnode="node2.example.com",
+            snodes=["node1.example.com"],
+            tags=["environment:staging"],
+            beparams=dataclasses.replace(instance.beparams, memory=2048),
+        )
+
+        cluster_index.put_instance(moved)
+
+        assert cluster_index.get_primary_instances("node1.example.com") == []
+        assert [i.name for i in cluster_index.get_primary_instances("node2.example.com")] == [
+            "instance1.example.com",
+            "instance2.example.com",
+        ]
+        assert cluster_index.get_node_capacity("node1.example.com").committed_memory == 0
+        assert cluster_index.get_node_capacity("node2.example.com").committed_memory == 1024 + 2048
+        assert [i.name for i in cluster_index.get_tagged_instances("environment:staging")] == ["instance1.example.com"]
+        assert len(cluster_index.get_tagged_instances("environment:production")) == 2
+
+    def test_apply(self, cluster_index: ClusterIndex) -> None:
+        node = cluster_index.get_node("node3.example.com")
+        assert node is not None
+        changes = SnapshotChanges(
+            instances=ChangeSet(removed=["instance3.example.com"]),
+            nodes=ChangeSet(changed=[dataclasses.replace(node, mfree=1000, tags=[])]),
+        )
+
+        cluster_index.apply(changes)
+
+        assert cluster_index.get_instance("instance3.example.com") is None
+        assert cluster_index.get_primary_instances("node3.example.com") == []
+        assert cluster_index.get_secondary_peers("node1.example.com") == {"node2.example.com"}
+        assert cluster_index.get_node_capacity("node3.example.com").mfree == 1000
+        assert cluster_index.get_node_capacity("node3.example.com").committed_memory == 0
+        assert len(cluster_index.get_tagged_nodes("environment:production")) == 2
@@ -0,0 +1,95 @@
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from client.api_client import BaseApiClient
+from client.exceptions import GanetiRAPIClientError
+
+MockResponseFactory = Callable[[Any, int], MagicMock]
+
+
+def _connection_refused(url: str) -> requests.exceptions.ConnectionError:
+    reason = NewConnectionError(MagicMock(), "Connection refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(MagicMock(), url, reason))
+
+
+@pytest.fixture
+def failover_client(mock_session: MagicMock, monkeypatch: pytest.MonkeyPatch) -> BaseApiClient:
+    client = BaseApiClient(["node1.example.com:5080", "node2.example.com:5080", "node3:5080"], "username", "password")
+    monkeypatch.setattr(client, "_session", mock_session)
+    return client
+
+
+def _route(
+    mock_response: MockResponseFactory, down: set[str], master: str, redirecting: frozenset[str] = frozenset()
+) -> Callable[..., MagicMock]:
+    """Simulate a cluster where the hosts in ``down`` refuse connections."""
+
+    def _request(method: str, url: str, **kwargs: Any) -> MagicMock:
+        host = url.split("/")[2].split(":")[0]
+        if host in down:
+            raise _connection_refused(url)
+        if host in redirecting:
+            response = mock_response({}, 302)
+            response.is_redirect = True
+            return response
+        if url.endswith("/2/info"):
+            return mock_response({"master": master}, 200)
+        return mock_response({"host": host}, 200)
+
+    return _request
+
+
+class TestMasterFailover:
+    def test_single_address(self, api_client: BaseApiClient) -> None:
+        assert api_client.rapi_addresses == ["localhost"]
+        assert api_client.base_url == "https://localhost/2"
+
+    def test_fail_over_on_connection_error(
+        self, failover_client: BaseApiClient, mock_session: MagicMock, mock_response: MockResponseFactory
+    ) -> None:
+        mock_session.request.side_effect = _route(mock_response, down={"node1.example.com"}, master="node3.example.com")
+
+        assert failover_client.get("instances") == {"host": "node3"}
+        # the master named by the cluster is used, not the first candidate that answered
+        assert failover_client.master_address == "node3:5080"
+        assert failover_client.base_url == "https://node3:5080/2"
+
+        # the new master is remembered, no further probing
+        mock_session.request.reset_mock()
+        assert failover_client.put("instances/vm1/startup") == {"host": "node3"}
+        mock_session.request.assert_called_once()
+
+    def test_no_reachable_master(
+        self, failover_client: BaseApiClient, mock_session: MagicMock, mock_response: MockResponseFactory
+    ) -> None:
+        mock_session.request.side_effect = _route(
+            mock_response, down={"node1.example.com", "node2.example.com", "node3"}, master="node1.example.com"
+        )
+
+        with pytest.raises(GanetiRAPIClientError):
+            failover_client.get("instances")
+        assert failover_client.master_address == "node1.example.com:5080"
+
+    def test_fail_over_on_redirect(
+        self, failover_client: BaseApiClient, mock_session: MagicMock, mock_response: MockResponseFactory
+    ) -> None:
+        mock_session.request.side_effect = _route(
+            mock_response, down=set(), master="node2.example.com", redirecting=frozenset({"node1.example.com"})
+        )
+
+        assert failover_client.get("nodes") == {"host": "node2.example.com"}
+        assert mock_session.request.call_args_list[0][1]["allow_redirects"] is False
+        assert failover_client.master_address == "node2.example.com:5080"
+
+    def test_no_repeat_of_sent_write_request(
+        self, failover_client: BaseApiClient, mock_session: MagicMock, mock_response: MockResponseFactory
+    ) -> None:
+        mock_session.request.side_effect = requests.exceptions.ConnectionError("Connection reset by peer")
+
+        with pytest.raises(GanetiRAPIClientError):
+            failover_client.put("instances/vm1/startup")
+        mock_session.request.assert_called_once()
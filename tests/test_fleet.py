@@ -0,0 +1,98 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from client import GanetiRapiClient
+from client.exceptions import ServerError
+from client.fleet import FleetClient
+
+
+def _cluster_client(instance_names: list[str]) -> MagicMock:
+    client = MagicMock()
+    client.instance_service.get_instance_names.return_value = instance_names
+    return client
+
+
+class TestFleetClient:
+    def test_run(self) -> None:
+        fleet = FleetClient({"a": _cluster_client(["vm1"]), "b": _cluster_client(["vm2", "vm3"])}, max_workers=2)
+
+        results = fleet.run(lambda client: len(client.instance_service.get_instance_names()))
+
+        assert list(results) == ["a", "b"]
+        assert results["a"].ok
+        assert results["a"].value == 1
+        assert results["b"].value == 2
+
+    def test_partial_failure(self) -> None:
+        failing = _cluster_client([])
+        failing.instance_service.get_instance_names.side_effect = ServerError("Bad Gateway", 502, "instances")
+        fleet = FleetClient({"a": _cluster_client(["vm1"]), "b": failing, "c": _cluster_client(["vm2"])})
+
+        results = fleet.find_instance("vm2")
+
+        assert results["a"].value is False
+        assert not results["b"].ok
+        assert isinstance(results["b"].error, ServerError)
+        assert results["c"].value is True
+
+    def test_timeout(self) -> None:
+        release = threading.Event()
+        hanging = _cluster_client([])
+        hanging.instance_service.get_instance_names.side_effect = lambda: release.wait(5) and []
+        fleet = FleetClient({"a": _cluster_client(["vm1"]), "b": hanging}, timeout=0.1)
+
+        try:
+            results = fleet.find_instance("vm1")
+        finally:
+            release.set()
+
+        assert results["a"].value is True
+        assert isinstance(results["b"].error, TimeoutError)
+        assert "Cluster b timed out" in str(results["b"].error)
+
+    def test_timed_out_clusters_dont_block_queued_clusters(self) -> None:
+        release = threading.Event()
+        clients = {}
+        for name in ("hung1", "hung2"):
+            clients[name] = _cluster_client([])
+            clients[name].instance_service.get_instance_names.side_effect = lambda: release.wait(5) and []
+        clients["fast"] = _cluster_client(["vm1"])
+        fleet = FleetClient(clients, max_workers=2, timeout=0.1)
+
+        start = time.monotonic()
+        try:
+            results = fleet.find_instance("vm1")
+        finally:
+            release.set()
+
+        assert time.monotonic() - start < 1
+        assert isinstance(results["hung1"].error, TimeoutError)
+        assert isinstance(results["hung2"].error, TimeoutError)
+        assert results["fast"].value is True
+
+    def test_from_addresses_sets_request_timeout(self) -> None:
+        fleet = FleetClient.from_addresses({"a": "a.example.com:5080"}, "user", "password", timeout=2.5)
+        try:
+            assert fleet.clients["a"]._client.timeout == 2.5
+        finally:
+            fleet.close()
+
+    def test_bounded_parallelism(self) -> None:
+        lock = threading.Lock()
+        running = [0, 0]  # current, maximum
+
+        def _call(client: GanetiRapiClient) -> None:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+
+        fleet = FleetClient({f"c{i}": _cluster_client([]) for i in range(12)}, max_workers=3)
+
+        results = fleet.run(_call)
+
+        assert all(result.ok for result in results.values())
+        assert running[1] <= 3
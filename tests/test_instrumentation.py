@@ -0,0 +1,133 @@
+from datetime import timedelta
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from client.api_client import BaseApiClient
+from client.exceptions import GanetiRAPIClientError
+from client.instrumentation import MetricsCollector, RequestEvent, endpoint_template
+from client.retry import RetryPolicy
+
+
+@pytest.mark.parametrize(
+    "endpoint, template",
+    [
+        ("instances", "instances"),
+        ("instances/vm1.example.com", "instances/{name}"),
+        ("instances/vm1.example.com/migrate", "instances/{name}/migrate"),
+        ("instances/vm1.example.com/disk/0/grow", "instances/{name}/disk/{index}/grow"),
+        ("nodes/node1.example.com/role", "nodes/{name}/role"),
+        ("jobs/123/wait", "jobs/{job_id}/wait"),
+        ("query/instance", "query/instance"),
+        ("instances-multi-alloc", "instances-multi-alloc"),
+    ],
+)
+def test_endpoint_template(endpoint: str, template: str) -> None:
+    assert endpoint_template(endpoint) == template
+
+
+def _event(endpoint: str, duration: float, status_code: int = 200) -> RequestEvent:
+    return RequestEvent("GET", endpoint, endpoint_template(endpoint), "localhost", 1, duration, status_code=status_code)
+
+
+class TestMetricsCollector:
+    def test_summary(self) -> None:
+        collector = MetricsCollector()
+        for i in range(1, 101):
+            collector(_event(f"instances/vm{i}", i / 1000, status_code=500 if i == 100 else 200))
+        collector(_event("nodes", 0.5))
+
+        summary = collector.summary()
+
+        assert list(summary) == ["GET instances/{name}", "GET nodes"]
+        instances = summary["GET instances/{name}"]
+        assert instances["count"] == 100
+        assert instances["errors"] == 1
+        assert instances["p50"] == pytest.approx(0.05)
+        assert instances["p95"] == pytest.approx(0.095)
+        assert instances["p99"] == pytest.approx(0.099)
+        assert instances["max"] == pytest.approx(0.1)
+        assert summary["GET nodes"]["p99"] == 0.5
+
+    def test_max_samples(self) -> None:
+        collector = MetricsCollector(max_samples=2)
+        for duration in (10.0, 1.0, 2.0):
+            collector(_event("nodes", duration))
+
+        summary = collector.summary()["GET nodes"]
+
+        assert summary["count"] == 3
+        assert summary["max"] == 2.0
+
+    def test_reset(self) -> None:
+        collector = MetricsCollector()
+        collector(_event("nodes", 1.0))
+
+        collector.reset()
+
+        assert collector.summary() == {}
+
+
+class TestRequestHooks:
+    def test_event(
+        self, api_client: BaseApiClient, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        response = mock_response(123, 200)
+        response.headers = {"Content-Length": "3"}
+        response.elapsed = timedelta(milliseconds=20)
+        mock_session.request.return_value = response
+        events: list[RequestEvent] = []
+        api_client.add_request_hook(events.append)
+
+        api_client.put("instances/vm1/migrate")
+
+        assert len(events) == 1
+        event = events[0]
+        assert (event.method, event.endpoint, event.endpoint_template) == (
+            "PUT",
+            "instances/vm1/migrate",
+            "instances/{name}/migrate",
+        )
+        assert event.address == "localhost"
+        assert event.attempt == 1
+        assert event.status_code == 200
+        assert event.response_bytes == 3
+        assert event.time_to_headers == pytest.approx(0.02)
+        assert event.duration >= 0
+        assert event.error is None
+
+    def test_retries_and_errors(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("client.api_client.time.sleep", MagicMock())
+        error = requests.exceptions.ReadTimeout("timed out")
+        mock_session.request.side_effect = [mock_response(None, 503), error, error]
+        collector = MetricsCollector()
+        events: list[RequestEvent] = []
+        api_client.add_request_hook(collector)
+        api_client.add_request_hook(events.append)
+
+        with pytest.raises(GanetiRAPIClientError):
+            api_client.get("nodes", retry_policy=RetryPolicy(max_attempts=3))
+
+        assert [(event.attempt, event.status_code) for event in events] == [(1, 503), (2, None), (3, None)]
+        assert events[2].error is error
+        assert collector.summary()["GET nodes"]["errors"] == 3
+
+    def test_remove_request_hook(
+        self, api_client: BaseApiClient, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        mock_session.request.return_value = mock_response(123, 200)
+        hook = MagicMock()
+        api_client.add_request_hook(hook)
+        api_client.remove_request_hook(hook)
+
+        api_client.get("nodes")
+
+        hook.assert_not_called()
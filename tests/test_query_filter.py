@@ -0,0 +1,38 @@
+import pytest
+
+from client.query_filter import and_, any_of, contains, eq, ge, is_true, lt, ne, not_, or_, regex
+
+
+class TestQueryFilter:
+    def test_comparisons(self) -> None:
+        assert eq("pnode", "node1").to_json() == ["=", "pnode", "node1"]
+        assert ne("status", "running").to_json() == ["!=", "status", "running"]
+        assert lt("oper_ram", 1024).to_json() == ["<", "oper_ram", 1024]
+        assert ge("serial_no", 3).to_json() == [">=", "serial_no", 3]
+        assert regex("name", "^web").to_json() == ["=~", "name", "^web"]
+        assert contains("tags", "env:prod").to_json() == ["=[]", "tags", "env:prod"]
+        assert is_true("oper_state").to_json() == ["?", "oper_state"]
+
+    def test_operators(self) -> None:
+        qfilter = eq("pnode", "node1") & ~eq("status", "running") | regex("name", "^db")
+
+        assert qfilter.to_json() == [
+            "|",
+            ["&", ["=", "pnode", "node1"], ["!", ["=", "status", "running"]]],
+            ["=~", "name", "^db"],
+        ]
+        assert qfilter == or_(and_(eq("pnode", "node1"), not_(eq("status", "running"))), regex("name", "^db"))
+
+    def test_flatten(self) -> None:
+        assert (eq("a", 1) & eq("b", 2) & eq("c", 3)).to_json() == ["&", ["=", "a", 1], ["=", "b", 2], ["=", "c", 3]]
+        assert any_of("id", [1, 2]).to_json() == ["|", ["=", "id", 1], ["=", "id", 2]]
+
+    def test_any_of_without_values(self) -> None:
+        with pytest.raises(ValueError):
+            any_of("name", [])
+
+    def test_hashable(self) -> None:
+        filters = {eq("pnode", "node1") & contains("tags", "a"), eq("pnode", "node1") & contains("tags", "a")}
+
+        assert len(filters) == 1
+        assert {any_of("id", [1, 2]): "jobs"}[any_of("id", [1, 2])] == "jobs"
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from client.api_client import BaseApiClient
+from client.rate_limit import RateLimiter, TokenBucket, is_read_request
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Fake clock of the rate limiter, sleeping advances it."""
+    now = [1000.0]
+
+    def _sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    monkeypatch.setattr("client.rate_limit.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("client.rate_limit.time.sleep", _sleep)
+    return now
+
+
+class TestTokenBucket:
+    def test_rate(self, clock: list[float]) -> None:
+        bucket = TokenBucket(rate=4, burst=2)
+
+        for _ in range(10):
+            bucket.acquire()
+
+        # the burst is free, the remaining 8 tokens take 2 seconds
+        assert clock[0] == pytest.approx(1002.0)
+
+    def test_refill_is_capped_at_burst(self, clock: list[float]) -> None:
+        bucket = TokenBucket(rate=1, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        clock[0] += 60
+
+        for _ in range(3):
+            bucket.acquire()
+
+        assert clock[0] == pytest.approx(1061.0)
+
+    def test_invalid_rate(self) -> None:
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    def test_separate_read_and_write_budgets(self, clock: list[float]) -> None:
+        limiter = RateLimiter(read_rate=64, write_rate=1, write_burst=1)
+
+        for _ in range(64):
+            with limiter.limit("GET"):
+                pass
+        assert clock[0] == pytest.approx(1000.0)
+
+        for _ in range(3):
+            with limiter.limit("PUT"):
+                pass
+        assert clock[0] == pytest.approx(1002.0)
+
+    def test_queries_use_the_read_budget(self, clock: list[float]) -> None:
+        limiter = RateLimiter(read_rate=64, write_rate=1, write_burst=1)
+
+        for _ in range(64):
+            with limiter.limit("PUT", "query/job"):
+                pass
+        assert clock[0] == pytest.approx(1000.0)
+        assert not is_read_request("PUT", "instances/vm1/modify")
+
+    def test_max_concurrent(self) -> None:
+        limiter = RateLimiter(max_concurrent_writes=2)
+        lock = threading.Lock()
+        running = [0, 0]  # current, maximum
+
+        def _write(_: int) -> None:
+            with limiter.limit("POST"):
+                with lock:
+                    running[0] += 1
+                    running[1] = max(running)
+                threading.Event().wait(0.005)
+                with lock:
+                    running[0] -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(_write, range(16)))
+
+        assert running[1] == 2
+
+    def test_api_client(
+        self, api_client: BaseApiClient, mock_session: MagicMock, mock_response: Callable[[Any, int], MagicMock]
+    ) -> None:
+        limiter = MagicMock(wraps=RateLimiter())
+        api_client.rate_limiter = limiter
+        mock_session.request.return_value = mock_response(123, 200)
+
+        api_client.get("instances")
+        api_client.put("instances/vm1/startup")
+
+        assert [c[0] for c in limiter.limit.call_args_list] == [("GET", "instances"), ("PUT", "instances/vm1/startup")]
@@ -0,0 +1,82 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from client.api_client import BaseApiClient
+from client.exceptions import GanetiRAPIClientError, ResourceNotFoundError
+from client.recording import RecordingAdapter, ReplayAdapter, ResponseRecording
+from client.services.instance_service import InstanceService
+
+
+@pytest.fixture
+def live_rapi(monkeypatch: pytest.MonkeyPatch, _testdata_dir: Path) -> list[requests.PreparedRequest]:
+    """Answer the requests of HTTPAdapter with the test data and return the requests sent."""
+    sent: list[requests.PreparedRequest] = []
+    bulk = (_testdata_dir / "v2_get_instances_bulk.json").read_bytes()
+
+    def _send(self: HTTPAdapter, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        sent.append(request)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url or ""
+        response.headers["Content-Type"] = "application/json"
+        if "/2/instances?bulk=1" in response.url:
+            response.status_code = 200
+            response._content = bulk
+        else:
+            response.status_code = 404
+            response._content = b'{"message": "Not found"}'
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", _send)
+    return sent
+
+
+class TestRecording:
+    def test_record_and_replay(self, live_rapi: list[requests.PreparedRequest], tmp_path: Path) -> None:
+        recording = ResponseRecording()
+        with BaseApiClient("master.example.com", "user", "password", transport=RecordingAdapter(recording)) as client:
+            recorded = InstanceService(client).get_instances()
+            with pytest.raises(ResourceNotFoundError):
+                InstanceService(client).get_instance("unknown.example.com")
+        assert len(live_rapi) == 2
+        recording.save(tmp_path / "cluster.json.gz")
+
+        loaded = ResponseRecording.load(tmp_path / "cluster.json.gz")
+        with BaseApiClient("other.example.com", "user", "password", transport=ReplayAdapter(loaded)) as client:
+            service = InstanceService(client)
+            replayed = service.get_instances()
+            streamed = list(service.iter_instances())
+            with pytest.raises(ResourceNotFoundError):
+                service.get_instance("unknown.example.com")
+
+        # nothing was sent while replaying
+        assert len(live_rapi) == 2
+        assert replayed == recorded
+        assert streamed == recorded
+
+    def test_not_recorded(self) -> None:
+        client = BaseApiClient("master.example.com", "user", "password", transport=ReplayAdapter(ResponseRecording()))
+
+        with pytest.raises(GanetiRAPIClientError) as exc:
+            client.get("nodes", bulk=1)
+
+        assert "No recorded response for GET /2/nodes?bulk=1" in str(exc.value)
+
+    def test_key(self) -> None:
+        def _request(method: str, url: str, json: Any = None) -> requests.PreparedRequest:
+            return requests.Request(method, url, json=json).prepare()
+
+        key = ResponseRecording.key
+        assert key(_request("GET", "https://a/2/instances?fields=name&bulk=1")) == key(
+            _request("GET", "https://b/2/instances?bulk=1&fields=name")
+        )
+        assert key(_request("PUT", "https://a/2/query/job", {"fields": ["id"], "qfilter": None})) == key(
+            _request("PUT", "https://a/2/query/job", {"qfilter": None, "fields": ["id"]})
+        )
+        assert key(_request("PUT", "https://a/2/query/job", {"fields": ["id"]})) != key(
+            _request("PUT", "https://a/2/query/job", {"fields": ["status"]})
+        )
@@ -0,0 +1,114 @@
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from client.api_client import BaseApiClient
+from client.exceptions import GanetiRAPIClientError, ServerError
+from client.retry import RetryPolicy
+
+
+@pytest.fixture
+def sleep_mock(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    sleep = MagicMock()
+    monkeypatch.setattr("client.api_client.time.sleep", sleep)
+    return sleep
+
+
+class TestRetryPolicy:
+    def test_backoff_with_jitter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        uniform = MagicMock(side_effect=lambda low, high: high)
+        monkeypatch.setattr("client.retry.random.uniform", uniform)
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3.0)
+
+        assert [policy.get_backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    def test_retry_after(self) -> None:
+        policy = RetryPolicy(max_backoff=10.0)
+        response = MagicMock(headers={"Retry-After": "4"})
+
+        assert policy.get_backoff(1, response) == 4.0
+        response.headers = {"Retry-After": "120"}
+        assert policy.get_backoff(1, response) == 10.0
+        response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        assert policy.get_backoff(1, response) == 0.0
+
+    def test_can_retry(self) -> None:
+        policy = RetryPolicy(max_attempts=2)
+
+        assert policy.can_retry("get", 1)
+        assert not policy.can_retry("GET", 2)
+        assert not policy.can_retry("POST", 1)
+
+
+class TestRequestRetry:
+    def test_retry_status_code(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        sleep_mock: MagicMock,
+    ) -> None:
+        unavailable = mock_response({"message": "Service Unavailable"}, 503)
+        unavailable.headers = {"Retry-After": "2"}
+        mock_session.request.side_effect = [unavailable, mock_response(["node1"], 200)]
+        api_client.retry_policy = RetryPolicy()
+
+        assert api_client.get("nodes") == ["node1"]
+        assert mock_session.request.call_count == 2
+        sleep_mock.assert_called_once_with(2.0)
+
+    def test_retry_exhausted(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        sleep_mock: MagicMock,
+    ) -> None:
+        mock_session.request.return_value = mock_response({"message": "Bad Gateway"}, 502)
+        api_client.retry_policy = RetryPolicy(max_attempts=3)
+
+        with pytest.raises(ServerError):
+            api_client.get("nodes")
+        assert mock_session.request.call_count == 3
+        assert sleep_mock.call_count == 2
+
+    def test_retry_connection_error(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        sleep_mock: MagicMock,
+    ) -> None:
+        mock_session.request.side_effect = [requests.exceptions.ConnectionError, mock_response(["node1"], 200)]
+
+        assert api_client.get("nodes", retry_policy=RetryPolicy()) == ["node1"]
+        assert mock_session.request.call_count == 2
+
+    def test_no_retry_for_non_idempotent_method(
+        self, api_client: BaseApiClient, mock_session: MagicMock, sleep_mock: MagicMock
+    ) -> None:
+        mock_session.request.side_effect = requests.exceptions.ConnectionError
+        api_client.retry_policy = RetryPolicy()
+
+        with pytest.raises(GanetiRAPIClientError):
+            api_client.put("instances/test-vm/startup")
+        mock_session.request.assert_called_once()
+        sleep_mock.assert_not_called()
+
+    def test_per_call_policy(
+        self,
+        api_client: BaseApiClient,
+        mock_session: MagicMock,
+        mock_response: Callable[[Any, int], MagicMock],
+        sleep_mock: MagicMock,
+    ) -> None:
+        mock_session.request.side_effect = [requests.exceptions.Timeout, mock_response(123, 200)]
+        api_client.retry_policy = RetryPolicy()
+
+        job_id = api_client.put("instances/test-vm/startup", retry_policy=RetryPolicy(retry_methods=frozenset({"PUT"})))
+
+        assert job_id == 123
+        assert "retry_policy" not in mock_session.request.call_args[1]
+        assert mock_session.request.call_args[1]["json"] == {}
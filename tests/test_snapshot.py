@@ -0,0 +1,137 @@
+import copy
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from client.api_client import BaseApiClient
+from client.snapshot import ClusterSnapshot
+
+
+@pytest.fixture
+def cluster(_testdata_dir: Path) -> dict[str, list[dict[str, Any]]]:
+    """Raw bulk data of the fake cluster, modify it to simulate changes."""
+    with open(_testdata_dir / "v2_get_instances_bulk.json", encoding="utf-8") as f:
+        instances = json.load(f)
+    with open(_testdata_dir / "v2_get_nodes_bulk.json", encoding="utf-8") as f:
+        nodes = json.load(f)
+    return {"instances": instances, "nodes": nodes}
+
+
+@pytest.fixture
+def snapshot(
+    api_client: BaseApiClient,
+    mock_session: MagicMock,
+    mock_response: Callable[[Any, int], MagicMock],
+    cluster: dict[str, list[dict[str, Any]]],
+) -> ClusterSnapshot:
+    def _route(method: str, url: str, params: Optional[dict[str, Any]] = None, **kwargs: Any) -> MagicMock:
+        resource, _, name = url.removeprefix("https://localhost/2/").partition("/")
+        if resource == "query":
+            # filters are built with any_of("name", ...)
+            names = {expression[2] for expression in kwargs["json"]["qfilter"][1:]}
+            fields = kwargs["json"]["fields"]
+            rows = [
+                [[0, obj[f]] if f in obj else [1, None] for f in fields]
+                for obj in cluster[f"{name}s"]
+                if obj["name"] in names
+            ]
+            return mock_response({"fields": [], "data": rows}, 200)
+        objects = cluster[resource]
+        if name:
+            return mock_response(copy.deepcopy(next(obj for obj in objects if obj["name"] == name)), 200)
+        if params and "fields" in params:
+            fields = params["fields"].split(",")
+            return mock_response([{f: obj[f] for f in fields} for obj in objects], 200)
+        return mock_response(copy.deepcopy(objects), 200)
+
+    mock_session.request.side_effect = _route
+    return ClusterSnapshot(api_client, max_single_fetches=1)
+
+
+class TestClusterSnapshot:
+    def test_initial_refresh(self, snapshot: ClusterSnapshot, mock_session: MagicMock) -> None:
+        changes = snapshot.refresh()
+
+        assert [instance.name for instance in changes.instances.added] == [
+            "instance1.example.com",
+            "instance2.example.com",
+            "instance3.example.com",
+        ]
+        assert len(changes.nodes.added) == 3
+        assert not changes.instances.changed
+        assert not changes.instances.removed
+        assert set(snapshot.instances) == {"instance1.example.com", "instance2.example.com", "instance3.example.com"}
+        # version listing and one query per resource
+        assert mock_session.request.call_count == 4
+        assert mock_session.request.call_args_list[1][0][1].endswith("/query/instance")
+
+    def test_refresh_without_changes(self, snapshot: ClusterSnapshot, mock_session: MagicMock) -> None:
+        snapshot.refresh()
+        mock_session.request.reset_mock()
+
+        changes = snapshot.refresh()
+
+        assert not changes
+        # only the version listings
+        assert mock_session.request.call_count == 2
+        assert all("fields" in c[1]["params"] for c in mock_session.request.call_args_list)
+
+    def test_incremental_refresh(
+        self, snapshot: ClusterSnapshot, mock_session: MagicMock, cluster: dict[str, list[dict[str, Any]]]
+    ) -> None:
+        snapshot.refresh()
+        mock_session.request.reset_mock()
+        cluster["instances"][1]["serial_no"] += 1
+        cluster["instances"][1]["status"] = "ADMIN_down"
+        del cluster["instances"][2]
+
+        changes = snapshot.refresh()
+
+        assert [instance.name for instance in changes.instances.changed] == ["instance2.example.com"]
+        assert changes.instances.removed == ["instance3.example.com"]
+        assert not changes.instances.added
+        assert not changes.nodes
+        assert snapshot.instances["instance2.example.com"].status == "ADMIN_down"
+        assert "instance3.example.com" not in snapshot.instances
+        # the changed instance is fetched on its own
+        assert mock_session.request.call_args_list[1][0][1].endswith("/instances/instance2.example.com")
+        assert mock_session.request.call_count == 3
+
+    def test_runtime_fields(
+        self, snapshot: ClusterSnapshot, mock_session: MagicMock, cluster: dict[str, list[dict[str, Any]]]
+    ) -> None:
+        snapshot.refresh()
+        mock_session.request.reset_mock()
+        cluster["instances"][0]["status"] = "ERROR_down"
+        cluster["instances"][0]["oper_state"] = False
+        cluster["nodes"][0]["mfree"] -= 1024
+
+        changes = snapshot.refresh()
+
+        assert [instance.name for instance in changes.instances.changed] == ["instance1.example.com"]
+        assert [node.name for node in changes.nodes.changed] == [cluster["nodes"][0]["name"]]
+        assert snapshot.instances["instance1.example.com"].status == "ERROR_down"
+        assert snapshot.instances["instance1.example.com"].oper_state is False
+        assert snapshot.nodes[cluster["nodes"][0]["name"]].mfree == cluster["nodes"][0]["mfree"]
+        # updated from the listings, without fetching the objects
+        assert mock_session.request.call_count == 2
+
+    def test_many_changes_are_queried_by_name(
+        self, snapshot: ClusterSnapshot, mock_session: MagicMock, cluster: dict[str, list[dict[str, Any]]]
+    ) -> None:
+        snapshot.refresh()
+        mock_session.request.reset_mock()
+        for instance in cluster["instances"][1:]:
+            instance["serial_no"] += 1
+
+        changes = snapshot.refresh()
+
+        assert [instance.name for instance in changes.instances.changed] == [
+            "instance2.example.com",
+            "instance3.example.com",
+        ]
+        body = mock_session.request.call_args_list[1][1]["json"]
+        assert body["qfilter"] == ["|", ["=", "name", "instance2.example.com"], ["=", "name", "instance3.example.com"]]
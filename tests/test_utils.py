@@ -0,0 +1,133 @@
+import json
+import pickle
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+import pytest
+
+from client.models.instance import BackendParams
+from client.utils import dict_to_dataclass, iter_json_array, with_slots
+
+
+@dataclass
+class _Disk:
+    disk_sizes: list[int]
+    beparams: BackendParams
+    name: Optional[str] = None
+
+
+@with_slots
+@dataclass
+class _Nic:
+    INTERNED_FIELDS: ClassVar[tuple[str, ...]] = ("mode", "links")
+    COMPACT_FIELDS: ClassVar[tuple[str, ...]] = ("params",)
+
+    mode: str
+    links: list[str]
+    params: dict[str, str]
+    mac: str = "00:00:00:00:00:00"
+
+
+class TestDictToDataclass:
+    def test_dotted_keys_and_nested(self) -> None:
+        disk = dict_to_dataclass(
+            _Disk, {"disk.sizes": [1024], "beparams": {"vcpus": 2, "memory": 512}, "unknown.key": 1, "name": "d0"}
+        )
+
+        assert disk == _Disk(disk_sizes=[1024], beparams=BackendParams(vcpus=2, memory=512), name="d0")
+
+    def test_plan_is_reused(self) -> None:
+        first = dict_to_dataclass(_Disk, {"disk.sizes": [1], "beparams": {"vcpus": 1, "memory": 1}})
+        second = dict_to_dataclass(_Disk, {"disk_sizes": [2], "beparams": {"vcpus": 2, "memory": 2}, "name": "x"})
+
+        assert first.disk_sizes == [1]
+        assert first.name is None
+        assert second.disk_sizes == [2]
+        assert second.beparams.vcpus == 2
+
+    def test_not_a_dataclass(self) -> None:
+        with pytest.raises(TypeError):
+            dict_to_dataclass(dict, {"a": 1})
+
+    def test_interned_fields(self) -> None:
+        # build the strings at runtime so they are not interned constants
+        mode, link, mac = "".join(["brid", "ged"]), "".join(["gnt-", "br"]), "".join(["52:54", ":00"])
+        first = dict_to_dataclass(_Nic, {"mode": mode, "links": [link], "params": {"vlan": "".join(["1", "00"])}})
+        second = dict_to_dataclass(
+            _Nic, {"mode": "".join(["brid", "ged"]), "links": ["".join(["gnt-", "br"])], "params": {"vlan": "100"}}
+        )
+        third = dict_to_dataclass(_Nic, {"mode": "bridged", "links": [], "params": {}, "mac": mac})
+
+        assert first.mode is second.mode
+        assert first.links[0] is second.links[0]
+        assert first.params["vlan"] is not second.params["vlan"]
+        assert third.mac is mac
+
+    def test_compact_fields(self) -> None:
+        first = dict_to_dataclass(
+            _Nic, {"mode": "bridged", "links": [], "params": {"vlan": "".join(["1", "00"])}}, True
+        )
+        second = dict_to_dataclass(
+            _Nic, {"mode": "bridged", "links": [], "params": {"vlan": "".join(["1", "00"])}}, True
+        )
+
+        assert first.params["vlan"] is second.params["vlan"]
+
+
+class TestWithSlots:
+    def test_slots(self) -> None:
+        nic = _Nic(mode="bridged", links=["gnt-br"], params={})
+
+        assert _Nic.__slots__ == ("mode", "links", "params", "mac")  # type: ignore[attr-defined]
+        assert not hasattr(nic, "__dict__")
+        assert nic.mac == "00:00:00:00:00:00"
+        with pytest.raises(AttributeError):
+            nic.unknown = 1  # type: ignore[attr-defined]
+
+    def test_pickle(self) -> None:
+        nic = _Nic(mode="bridged", links=["gnt-br"], params={"vlan": "100"}, mac="52:54:00:12:34:56")
+
+        assert pickle.loads(pickle.dumps(nic)) == nic
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 4096])
+    def test_chunked(self, chunk_size: int) -> None:
+        document = json.dumps([{"name": "vm1", "nic.ips": ["10.0.0.1"], "os": "d\u00e9bian"}, 1234567, "x", None, []])
+        data = document.encode()
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+        assert list(iter_json_array(chunks)) == json.loads(document)
+
+    @pytest.mark.parametrize(
+        "chunks",
+        [
+            [b"[1.", b"5]"],
+            [b"[1", b".5]"],
+            [b"[1.5e", b"3]"],
+            [b"[1.5e-", b"3]"],
+            [b"[-", b"1.5, 2]"],
+            [b"[1.5", b"E+3", b"]"],
+        ],
+    )
+    def test_split_numbers(self, chunks: list[bytes]) -> None:
+        assert list(iter_json_array(chunks)) == json.loads(b"".join(chunks))
+
+    def test_empty(self) -> None:
+        assert list(iter_json_array([b" [", b" ]\n"])) == []
+
+    def test_lazy(self) -> None:
+        def _chunks() -> Iterator[bytes]:
+            yield b'[{"id": 1},'
+            raise AssertionError("read beyond the first item")
+
+        assert next(iter_json_array(_chunks())) == {"id": 1}
+
+    @pytest.mark.parametrize(
+        "document",
+        [b'{"id": 1}', b'[{"id": 1} {"id": 2}]', b'[{"id": 1},', b'[{"id": ', b"[1,2]garbage", b"[] []"],
+    )
+    def test_invalid(self, document: bytes) -> None:
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array([document]))